@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Day 5: Hypothermal Venture
 
-Usage: solution.py -v 1|2 input.txt
+Usage: solution.py [-v] [--trace EVERY] 1|2 input.txt
 
 """
 
@@ -12,7 +12,9 @@ import typing as t
 from argparse import ArgumentParser
 from dataclasses import dataclass
 
-verbose = False
+from aoc.trace import Tracer
+
+tracer = Tracer()
 
 
 @dataclass
@@ -95,13 +97,15 @@ def main():
     parser.add_argument("part", type=int)
     parser.add_argument("filename")
     parser.add_argument("--verbose", "-v", action="store_true")
+    parser.add_argument("--trace", type=int, metavar="EVERY", help="sample the points")
 
-    global verbose
     args = parser.parse_args()
+    if args.trace is not None and args.trace < 1:
+        parser.error("--trace needs to print at least every 1st event")
     action = args.part
     filename = args.filename
-    if args.verbose:
-        verbose = True
+    if args.verbose or args.trace:
+        tracer.enable(sample=args.trace or 1)
 
     if action == 1:
         lines = [line for line in read_file(filename) if line.is_orthogonal()]
@@ -120,6 +124,9 @@ def main():
     else:
         return "Invalid action"
 
+    if tracer.enabled:
+        print(tracer.report())
+
 
 def read_file(filename) -> t.Iterator[Line]:
     with open(filename, "r") as f:
@@ -137,12 +144,13 @@ def build_map(lines: list[Line]) -> Ocean:
     for y in range(height):
         floor.append(row.copy())
 
+    tracing = tracer.enabled
     for line in lines:
-        if verbose:
-            print(line)
+        if tracing:
+            tracer.event("line", line)
         for point in line.walk():
-            if verbose:
-                print(point)
+            if tracing:
+                tracer.event("point", point)
             floor[point.y][point.x] += 1
 
     return Ocean(floor)
@@ -12,13 +12,9 @@ import typing as t
 from argparse import ArgumentParser
 from dataclasses import dataclass
 
-verbose = False
-
+from aoc.point import Point
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
+verbose = False
 
 
 P = Point
@@ -158,9 +154,12 @@ def step(grid: Grid) -> int:
 
 
 def cascade(grid: Grid, point: Point):
-    for neighbor in grid.neighbors(point, diagonal=True):
-        if grid[neighbor].increase():
-            cascade(grid, neighbor)
+    # a stack rather than recursion, as a large grid can flash all at once
+    flashing = [point]
+    while flashing:
+        for neighbor in grid.neighbors(flashing.pop(), diagonal=True):
+            if grid[neighbor].increase():
+                flashing.append(neighbor)
 
 
 def part2(filename):
@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """Day 12: Passage Pathing
 
-Usage: ./solution.py 1|2 FILE
+Usage: ./solution.py 1|2 FILE [--verbose] [--output PATHS] [--jobs N]
+
+The paths are counted without being built; `--verbose` prints each of them
+too, and with `--output` they're written to PATHS by a pool of processes (each
+taking some of the branches from the start cave).
 
 """
 
 from __future__ import annotations
 
+import shutil
 import sys
+import tempfile
 import typing as t
 from argparse import ArgumentParser
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import cache, cached_property
+from multiprocessing import cpu_count
+from pathlib import Path
 from pprint import pprint
 
 verbose = False
@@ -22,6 +31,8 @@ def main():
     parser.add_argument("part", type=int)
     parser.add_argument("filename")
     parser.add_argument("--verbose", "-v", action="store_true")
+    parser.add_argument("--output", "-o", type=Path, help="write the paths to a file")
+    parser.add_argument("--jobs", "-j", type=int, help="processes writing paths")
 
     global verbose
     args = parser.parse_args()
@@ -30,91 +41,228 @@ def main():
         verbose = True
 
     if args.part == 1:
-        part1(filename)
+        part1(filename, output=args.output, jobs=args.jobs)
     elif args.part == 2:
-        part2(filename)
+        part2(filename, output=args.output, jobs=args.jobs)
     else:
         return f"Invalid 'part' specified: {args.part}"
 
 
-def part1(filename):
+def part1(filename, *, output: Path | None = None, jobs: int | None = None):
     """How many paths through the cave (visit small rooms only once)."""
-    caves = read_file(filename)
+    caves = CaveSystem.from_graph(read_file(filename))
     if verbose:
         pprint(caves)
 
-    paths = find_path_part1(caves, "start", [])
-    for path in paths:
-        print(",".join(path))
-
-    print("Total:", len(paths))
-
-
-def find_path_part1(
-    caves: dict[str, set[str]], start: str, path: list[str]
-) -> list[list[str]]:
-    """Recursively find a path starting in `start`, only visit small rooms once."""
-    path.append(start)
-    if start == "end":
-        return [path]
-    paths = []
-    for room in caves[start]:
-        if room.islower() and room in set(path):
-            # skip small rooms we've already been in
-            continue
-        paths.extend(find_path_part1(caves, room, path.copy()))
+    if output:
+        total = write_paths(caves, output, jobs=jobs)
+        print(f"Wrote paths to {output}")
+    else:
+        total = caves.count_paths()
+        if verbose:
+            for path in caves.paths():
+                print(",".join(path))
 
-    return paths
+    print("Total:", total)
+    return total
 
 
-def part2(filename):
-    """How many paths through the cave (visit small rooms only once)."""
-    caves = read_file(filename)
+def part2(filename, *, output: Path | None = None, jobs: int | None = None):
+    """How many paths through the cave (visit *one* small cave twice)."""
+    caves = CaveSystem.from_graph(read_file(filename))
     if verbose:
         pprint(caves)
 
-    paths = find_path_part2(caves, "start", [])
-    for path in paths:
-        print(",".join(path))
-
-    print("Total:", len(paths))
-
-
-def find_path_part2(
-    caves: dict[str, set[str]], start: str, path: list[str]
-) -> list[list[str]]:
-    """Recursively find a path starting in `start`, only visit *one* small cave twice."""
-    path.append(start)
-    if start == "end":
-        return [path]
-    paths = []
-    for room in caves[start]:
-        if room.islower() and not can_visit2(room, path):
-            # skip small rooms if we've already been in one twice
-            continue
-        paths.extend(find_path_part2(caves, room, path.copy()))
-
-    return paths
-
-
-def can_visit2(room: str, path: list[str]) -> bool:
-    """Can we visit a small room?"""
-    visit_count = defaultdict(int)
-    for rm in path:
-        if not rm.islower():
-            continue
-        visit_count[rm] += 1
-
-    if room not in visit_count:
-        answer = True
-    elif 2 not in visit_count.values():
-        answer = True
+    if output:
+        total = write_paths(caves, output, allow_twice=True, jobs=jobs)
+        print(f"Wrote paths to {output}")
     else:
-        answer = False
+        total = caves.count_paths(allow_twice=True)
+        if verbose:
+            for path in caves.paths(allow_twice=True):
+                print(",".join(path))
 
-    if verbose:
-        print(f"Checking {room}: {path} = {answer}")
-    return answer
+    print("Total:", total)
+    return total
+
+
+# (cave, small caves visited bitmask, whether a small cave was visited twice)
+State = tuple[int, int, bool]
+
+
+@dataclass
+class CaveSystem:
+    """The cave graph with the caves numbered, for memoizing the path search.
+
+    The search state is (current cave, bitmask of the small caves visited,
+    whether a small cave has been visited twice), and the number of ways to
+    the end from a state doesn't depend on how it was reached.
+
+    """
+
+    names: list[str]
+    neighbors: list[tuple[int, ...]]
+    # the bit for each small cave (0 for big caves)
+    small_bits: list[int]
+    start: int
+    end: int
+
+    @classmethod
+    def from_graph(cls, caves: dict[str, set[str]]) -> CaveSystem:
+        names = sorted(
+            caves.keys() | {room for rooms in caves.values() for room in rooms}
+        )
+        ids = {name: index for index, name in enumerate(names)}
+        neighbors = [
+            tuple(sorted(ids[room] for room in caves.get(name, ()))) for name in names
+        ]
+        small_bits = [
+            1 << index if name.islower() else 0 for index, name in enumerate(names)
+        ]
+        return cls(names, neighbors, small_bits, ids["start"], ids["end"])
+
+    def __getstate__(self):
+        # the memoized counts don't pickle (and are cheap to rebuild)
+        state = self.__dict__.copy()
+        state.pop("_count", None)
+        return state
+
+    def initial_state(self, *, allow_twice: bool = False) -> State:
+        return (self.start, self.small_bits[self.start], not allow_twice)
+
+    def count_paths(self, *, allow_twice: bool = False) -> int:
+        """The number of paths from start to end, without building them."""
+        return self._count(*self.initial_state(allow_twice=allow_twice))
+
+    @cached_property
+    def _count(self) -> t.Callable[[int, int, bool], int]:
+        """The number of paths to the end from a state (memoized)."""
+        neighbors, small_bits, end = self.neighbors, self.small_bits, self.end
+
+        @cache
+        def count(cave: int, visited: int, twice_used: bool) -> int:
+            if cave == end:
+                return 1
+            total = 0
+            for room in neighbors[cave]:
+                bit = small_bits[room]
+                if visited & bit:
+                    if not twice_used:
+                        total += count(room, visited, True)
+                else:
+                    total += count(room, visited | bit, twice_used)
+            return total
+
+        return count
+
+    def next_states(self, state: State) -> t.Iterator[State]:
+        """The states reachable in one step that have a way to the end."""
+        cave, visited, twice_used = state
+        for room in self.neighbors[cave]:
+            bit = self.small_bits[room]
+            if visited & bit:
+                if twice_used:
+                    continue
+                next_state = (room, visited, True)
+            else:
+                next_state = (room, visited | bit, twice_used)
+            if self._count(*next_state):
+                yield next_state
+
+    def paths(self, *, allow_twice: bool = False) -> t.Iterator[list[str]]:
+        """Lazily yield each path (as the list of cave names).
+
+        Branches without a way to the end are skipped using the path counts.
+
+        """
+        return self.paths_from(
+            [self.start], self.initial_state(allow_twice=allow_twice)
+        )
+
+    def paths_from(self, prefix: list[int], state: State) -> t.Iterator[list[str]]:
+        """Yield each path that continues `prefix` (ending in `state`'s cave)."""
+        path = list(prefix)
+
+        def walk(state: State):
+            if state[0] == self.end:
+                yield [self.names[room] for room in path]
+                return
+            for next_state in self.next_states(state):
+                path.append(next_state[0])
+                yield from walk(next_state)
+                path.pop()
+
+        return walk(state)
+
+    def split(
+        self, branches: int, *, allow_twice: bool = False
+    ) -> list[tuple[list[int], State]]:
+        """Expand the search a level at a time until there are `branches` subtrees.
+
+        Returns the path to each subtree and its state.
+
+        """
+        frontier = [([self.start], self.initial_state(allow_twice=allow_twice))]
+        while len(frontier) < branches:
+            expanded = []
+            for prefix, state in frontier:
+                if state[0] == self.end:
+                    expanded.append((prefix, state))
+                    continue
+                expanded.extend(
+                    (prefix + [next_state[0]], next_state)
+                    for next_state in self.next_states(state)
+                )
+            if len(expanded) == len(frontier):
+                # nothing left to expand
+                break
+            frontier = expanded
+        return frontier
+
+
+def write_paths(
+    caves: CaveSystem,
+    output: Path,
+    *,
+    allow_twice: bool = False,
+    jobs: int | None = None,
+) -> int:
+    """Write every path to `output`, using a process per branch of the search.
+
+    Each worker streams its paths to a file of its own, which is appended to
+    `output` as soon as it's done. Returns the number of paths.
+
+    """
+    jobs = jobs or cpu_count()
+    branches = caves.split(jobs * 4, allow_twice=allow_twice)
+    total = 0
+    with tempfile.TemporaryDirectory(dir=output.parent) as tmp:
+        with open(output, "wb") as f, ProcessPoolExecutor(jobs) as executor:
+            futures = {
+                executor.submit(
+                    write_branch, caves, prefix, state, Path(tmp) / f"{index}.txt"
+                )
+                for index, (prefix, state) in enumerate(branches)
+            }
+            for future in as_completed(futures):
+                count, part_file = future.result()
+                total += count
+                with open(part_file, "rb") as part:
+                    shutil.copyfileobj(part, f)
+                part_file.unlink()
+    return total
+
+
+def write_branch(
+    caves: CaveSystem, prefix: list[int], state: State, output: Path
+) -> tuple[int, Path]:
+    count = 0
+    with open(output, "w") as f:
+        for path in caves.paths_from(prefix, state):
+            f.write(",".join(path))
+            f.write("\n")
+            count += 1
+    return count, output
 
 
 def read_file(filename) -> dict[str, set[str]]:
@@ -129,5 +277,40 @@ def read_file(filename) -> dict[str, set[str]]:
     return cave_graph
 
 
+SAMPLES = {
+    "start-A start-b A-c A-b b-d A-end b-end": (10, 36),
+    "dc-end HN-start start-kj dc-start dc-HN LN-dc HN-end kj-sa kj-HN kj-dc": (
+        19,
+        103,
+    ),
+    (
+        "fs-end he-DX fs-he start-DX pj-DX end-zg zg-sl zg-pj pj-he RW-he fs-DX"
+        " pj-RW zg-RW start-pj he-WI zg-he pj-fs start-RW"
+    ): (226, 3509),
+}
+
+
+def test_samples(tmp_path):
+    input_file = tmp_path / "input.txt"
+    for sample, expected in SAMPLES.items():
+        input_file.write_text("\n".join(sample.split()) + "\n")
+        assert (part1(input_file), part2(input_file)) == expected
+        # the memoized counts agree with building every path
+        caves = CaveSystem.from_graph(read_file(input_file))
+        for allow_twice, total in zip((False, True), expected):
+            paths = list(caves.paths(allow_twice=allow_twice))
+            assert len(paths) == len({tuple(path) for path in paths}) == total
+
+
+def test_write_paths(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("\n".join(next(iter(SAMPLES)).split()) + "\n")
+    caves = CaveSystem.from_graph(read_file(input_file))
+    output = tmp_path / "paths.txt"
+    assert write_paths(caves, output, allow_twice=True, jobs=2) == 36
+    written = sorted(output.read_text().splitlines())
+    assert written == sorted(",".join(path) for path in caves.paths(allow_twice=True))
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -13,13 +13,9 @@ import typing as t
 from argparse import ArgumentParser
 from dataclasses import dataclass, field
 
-verbose = False
-
+from aoc.point import Point
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
+verbose = False
 
 
 P = Point
@@ -3,30 +3,36 @@
 
 Finding the least risky path through the cave.
 
-Usage: ./solution.py 1|2 FILE
+Usage: ./solution.py 1|2 FILE [--algorithm dfs|best-first|dijkstra|astar|bidirectional]
+                                [--tiles N] [--jobs N]
 
 """
 
 from __future__ import annotations
 
+import heapq
 import sys
 import typing as t
 from argparse import ArgumentParser
 from collections import deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
-from multiprocessing import Process, Queue, cpu_count
-from operator import attrgetter
+from multiprocessing import Array, Condition, Lock, Process, Queue, Value, cpu_count
+from operator import itemgetter
+from queue import Empty
+
+from aoc.point import Point
+from aoc.search import (
+    UNREACHED,
+    GridNeighbors,
+    astar,
+    bidirectional_dijkstra,
+    manhattan,
+)
 
 verbose = False
 
 
-@dataclass(frozen=True, slots=True)
-class Point:
-    x: int
-    y: int
-
-
 P = Point
 
 
@@ -67,6 +73,11 @@ class Grid:
             if 0 <= point.y + delta < self.height:
                 yield Point(point.x, point.y + delta)
 
+    @property
+    def risk(self) -> t.Callable[[int], int]:
+        """Look up the risk of a cell by its index."""
+        return self._values.__getitem__
+
     def __str__(self):
         cols = [iter(self._values)] * self.width
         output = ["".join(str(val) for val in row) for row in zip(*cols)]
@@ -74,41 +85,75 @@ class Grid:
 
 
 @dataclass
-class Path:
-    nodes: set[Point] = field(default_factory=set)
-    end: Point | None = None
-    score: int = 0
+class TiledGrid:
+    """The grid repeated `tiles` times in each direction, with increasing risk.
+
+    Each tile to the right or down adds 1 to the risks (wrapping from 9 back
+    to 1), which is computed on the fly rather than stored.
+
+    """
+
+    tile: Grid
+    tiles: int = 5
+
+    def __post_init__(self):
+        self.width = self.tile.width * self.tiles
+        self.height = self.tile.height * self.tiles
+
+    def risk(self, index: int) -> int:
+        y, x = divmod(index, self.width)
+        tile_y, y = divmod(y, self.tile.height)
+        tile_x, x = divmod(x, self.tile.width)
+        risk = self.tile._values[y * self.tile.width + x] + tile_x + tile_y
+        return (risk - 1) % 9 + 1
+
+    def __getitem__(self, item: Point):
+        if not (0 <= item.x < self.width and 0 <= item.y < self.height):
+            raise IndexError(f"Not inside grid: {item}")
+        return self.risk(item.y * self.width + item.x)
+
+    def __iter__(self):
+        return (Point(x, y) for y in range(self.height) for x in range(self.width))
+
+    def __str__(self):
+        return "\n".join(
+            "".join(str(self.risk(y * self.width + x)) for x in range(self.width))
+            for y in range(self.height)
+        )
+
+
+# cells that weren't reached (or have no predecessor), as in `aoc.search`
+NO_CELL = UNREACHED
+
+
+@dataclass
+class Route:
+    """A path through the cave, as the indexes of its cells."""
+
+    risk: int
+    cells: list[int]
 
     @classmethod
-    def start(cls, point: Point) -> Path:
-        return cls({point}, point)
-
-    def add(self, spot: Point, grid: Grid):
-        if spot in self.nodes:
-            raise ValueError("Cannot visit nodes twice")
-        self.nodes.add(spot)
-        self.end = spot
-        self.score += grid[spot]
-
-    def copy(self) -> Path:
-        return Path(self.nodes.copy(), self.end, self.score)
-
-    def draw(self, grid):
-        output = ""
-        row = 0
-        for point in grid:
-            if point.y != row:
-                print(output)
-                output = ""
-                row = point.y
-            if point in self.nodes:
-                output += "."
-            else:
-                output += str(grid[point])
-        print(output)
+    def from_predecessors(cls, previous: t.Sequence[int], end: int, risk: int) -> Route:
+        """Follow the cell each cell was reached from back to the start."""
+        cells = [end]
+        while (end := previous[end]) != NO_CELL:
+            cells.append(end)
+        cells.reverse()
+        return cls(risk, cells)
+
+    def draw(self, grid: Grid | TiledGrid):
+        on_route = set(self.cells)
+        for y in range(grid.height):
+            print(
+                "".join(
+                    "." if index in on_route else str(grid.risk(index))
+                    for index in range(y * grid.width, (y + 1) * grid.width)
+                )
+            )
 
     def __str__(self):
-        return f"End: {self.end}; Len: {len(self.nodes)}; Score: {self.score}"
+        return f"End: {self.cells[-1]}; Len: {len(self.cells)}; Score: {self.risk}"
 
 
 def main():
@@ -116,6 +161,16 @@ def main():
     parser.add_argument("part", type=int)
     parser.add_argument("filename")
     parser.add_argument("--verbose", "-v", action="store_true")
+    parser.add_argument(
+        "--algorithm",
+        choices=("dfs", "best-first", "dijkstra", "astar", "bidirectional"),
+        help="dfs (the parallel branch and bound search) is the default for part 1,"
+        " dijkstra for part 2",
+    )
+    parser.add_argument(
+        "--tiles", type=int, default=5, help="how many times the map repeats in part 2"
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="processes for dfs")
 
     global verbose
     args = parser.parse_args()
@@ -123,10 +178,18 @@ def main():
     if args.verbose:
         verbose = True
 
-    if args.part == 1:
-        part1_parallel(filename)
+    if args.part == 1 and args.algorithm in (None, "dfs"):
+        part1_parallel(filename, jobs=args.jobs)
+    elif args.part == 1 and args.algorithm == "best-first":
+        part1(filename)
+    elif args.part == 1:
+        part1_dijkstra(filename, algorithm=args.algorithm)
+    elif args.part == 2 and args.algorithm == "best-first":
+        return "Part 2 can't use the best-first algorithm"
+    elif args.part == 2 and args.algorithm == "dfs":
+        part2_parallel(filename, tiles=args.tiles, jobs=args.jobs)
     elif args.part == 2:
-        part2(filename)
+        part2(filename, tiles=args.tiles, algorithm=args.algorithm or "dijkstra")
     else:
         return f"Invalid 'part' specified: {args.part}"
 
@@ -138,129 +201,335 @@ def part1(filename):
         print(grid)
         print()
 
-    paths = deque((Path.start(P(0, 0)),))
+    width, height = grid.width, grid.height
+    target = width * height - 1
+    best = [sys.maxsize] * (width * height)
+    best[0] = 0
+    previous = [NO_CELL] * (width * height)
+    # (score, cell index)
+    paths = deque([(0, 0)])
     print(datetime.now())
 
     count = 0
-    best_path = None
-    while best_path is None:
-        path = paths.popleft()
+    route = Route(0, [0]) if target == 0 else None
+    while route is None:
+        score, index = paths.popleft()
+        if score > best[index]:
+            continue
 
         count += 1
         if count % 10000 == 0:
             if verbose:
-                print(f"{len(paths) + 1} ({path.score}); ", end="", flush=True)
+                print(f"{len(paths) + 1} ({score}); ", end="", flush=True)
             else:
                 print(".", end="", flush=True)
 
-        for point in grid.neighbors(path.end):
-            if point in path.nodes:
+        y, x = divmod(index, width)
+        for neighbor, inside in (
+            (index - width, y > 0),
+            (index - 1, x > 0),
+            (index + 1, x < width - 1),
+            (index + width, y < height - 1),
+        ):
+            if not inside:
+                continue
+            new_score = score + grid.risk(neighbor)
+            if new_score >= best[neighbor]:
                 continue
-            new_path = path.copy()
-            new_path.add(point, grid)
-            if new_path.end == P(grid.width - 1, grid.height - 1):
+            best[neighbor] = new_score
+            previous[neighbor] = index
+            if neighbor == target:
                 # found the end
-                best_path = new_path
+                route = Route.from_predecessors(previous, target, new_score)
                 break
-            paths.appendleft(new_path)
+            paths.appendleft((new_score, neighbor))
 
-        paths = deque(sorted(paths, key=attrgetter("score")))
+        paths = deque(sorted(paths, key=itemgetter(0)))
 
     print()
     print(datetime.now())
     print()
     if verbose:
-        best_path.draw(grid)
+        route.draw(grid)
         print()
-    print("Best score:", best_path.score)
+    print("Best score:", route.risk)
 
 
-def part1_parallel(filename):
-    """My original depth-first approach, with multiprocessing."""
-
+def part1_parallel(filename, *, jobs: int | None = None):
+    """My original multiprocessing approach, now sharing the work as it goes."""
     grid = read_file(filename)
     if verbose:
         print(grid)
         print()
 
-    process_count = cpu_count()
-
-    # use a list right now because this is going to be a short list
-    paths = [Path.start(P(0, 0))]
     print(datetime.now())
-    while len(paths) <= process_count:
-        path = paths.pop()
-        for point in grid.neighbors(path.end):
-            if point in path.nodes:
-                continue
-            new_path = path.copy()
-            new_path.add(point, grid)
-            paths.append(new_path)
+    route = parallel_best_route(grid, jobs=jobs)
+    print(datetime.now())
+    print()
+    if verbose:
+        route.draw(grid)
+        print()
+    print("Best score:", route.risk)
 
-    print(f"Loaded {len(paths)} initial paths")
-    processes = []
-    que = Queue()
-    for path in paths:
-        p = Process(target=depth_first_subprocess, args=([path], grid, que))
-        p.start()
-        processes.append(p)
 
-    results = []
-    for _ in paths:
-        results.append(que.get())
+@dataclass
+class SharedSearch:
+    """The state shared by the search processes.
+
+    Work is (risk so far, cell index) pairs: since a path is pruned as soon
+    as it reaches a cell no less risky than the best known route there, the
+    search doesn't need to remember which cells a path visited. The best
+    risk to every cell, including the end (the upper bound every process
+    prunes against), is shared by all of them.
+
+    The shared values are read without locking (they only ever go down, so
+    a stale read just means a little extra searching). Updating a cell takes
+    one of `LOCK_STRIPES` locks, picked by its index, so processes only wait
+    for each other when they improve cells in the same stripe.
+
+    Each process publishes the risk of the path it's searching in `fronts`,
+    and doesn't search a path more than `SLACK` riskier than another
+    process's. Without that, a process that got ahead would keep searching
+    cells that another would then reach with less risk, and search again.
+    A process that is ahead sleeps on `advanced`, which is notified whenever
+    a front moves on (to a riskier path, or to idle), rather than spinning.
+
+    """
+
+    queue: Queue
+    best: t.Any  # multiprocessing.Array of the lowest known risk to each cell
+    previous: t.Any  # multiprocessing.Array of the cell each was reached from
+    locks: list  # striped, for updating `best` and `previous` together
+    bound: t.Any  # multiprocessing.Value of the lowest risk to the end so far
+    bound_lock: t.Any
+    pending: t.Any  # batches of work queued or being searched
+    idle: t.Any  # processes waiting for work
+    searched: t.Any  # cells searched by all the processes (some more than once)
+    fronts: t.Any  # multiprocessing.Array of the risk each process is searching
+    advanced: t.Any  # multiprocessing.Condition, notified when a front goes up
+
+    DONATE_EVERY: t.ClassVar[int] = 1000
+    LOCK_STRIPES: t.ClassVar[int] = 64
+    # paths with the same risk are searched in parallel, which is plenty
+    SLACK: t.ClassVar[int] = 0
 
-    for p in processes:
-        p.join()
+    @classmethod
+    def create(cls, size: int, jobs: int) -> SharedSearch:
+        best = Array("q", [sys.maxsize] * size, lock=False)
+        previous = Array("q", [NO_CELL] * size, lock=False)
+        return cls(
+            Queue(),
+            best,
+            previous,
+            [Lock() for _ in range(cls.LOCK_STRIPES)],
+            Value("q", sys.maxsize, lock=False),
+            Lock(),
+            Value("i", 0),
+            Value("i", 0),
+            Value("q", 0),
+            Array("q", [sys.maxsize] * jobs, lock=False),
+            Condition(),
+        )
+
+    def put(self, items: list[tuple[int, int]]):
+        """Queue some work, as one batch (which is searched by one process)."""
+        with self.pending.get_lock():
+            self.pending.value += 1
+        self.queue.put(items)
+
+    def done(self):
+        with self.pending.get_lock():
+            self.pending.value -= 1
+
+    def advance(self, fronts: memoryview, worker: int, risk: int):
+        """Move a process's front on to `risk`, waking any waiting for it."""
+        with self.advanced:
+            fronts[worker] = risk
+            self.advanced.notify_all()
+
+    def improve_bound(self, risk: int):
+        with self.bound_lock:
+            if risk < self.bound.value:
+                self.bound.value = risk
+
+
+def parallel_best_route(grid: Grid | TiledGrid, *, jobs: int | None = None) -> Route:
+    """Branch and bound search, with processes sharing out their work.
+
+    Each process searches the least risky paths in its own heap first, and
+    when other processes are idle it gives away half of the heap. Paths are
+    pruned once their risk plus the distance left can't beat the bound, and
+    no process gets ahead of the others (see `SharedSearch`), so each cell is
+    searched about once in total.
+
+    """
+    if grid.width * grid.height == 1:
+        # already at the end, and the search only looks at cells it moves into
+        return Route(0, [0])
+    jobs = jobs or cpu_count()
+    shared = SharedSearch.create(grid.width * grid.height, jobs)
+    shared.best[0] = 0
+    shared.put([(0, 0)])
+    processes = [
+        Process(target=search_worker, args=(grid, shared, worker))
+        for worker in range(jobs)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    if verbose:
+        print(f"Searched {shared.searched.value:,} cells")
+    return Route.from_predecessors(
+        shared.previous, grid.width * grid.height - 1, shared.bound.value
+    )
+
+
+def search_worker(grid: Grid | TiledGrid, shared: SharedSearch, worker: int):
+    width, height = grid.width, grid.height
+    last_x, last_y = width - 1, height - 1
+    target = width * height - 1
+    risk_of = grid.risk
+    # indexing memoryviews of the shared arrays is quicker than the arrays
+    best = memoryview(shared.best).cast("B").cast("q")
+    previous = memoryview(shared.previous).cast("B").cast("q")
+    locks, stripes, bound = shared.locks, shared.LOCK_STRIPES, shared.bound
+    fronts = memoryview(shared.fronts).cast("B").cast("q")
+    slack, advanced = shared.SLACK, shared.advanced
+
+    heap = []
+    searched = 0
+    while True:
+        if not heap:
+            shared.advance(fronts, worker, sys.maxsize)
+            with shared.idle.get_lock():
+                shared.idle.value += 1
+            try:
+                while True:
+                    try:
+                        heap = shared.queue.get(timeout=0.01)
+                        break
+                    except Empty:
+                        if shared.pending.value == 0:
+                            with shared.searched.get_lock():
+                                shared.searched.value += searched
+                            return
+            finally:
+                with shared.idle.get_lock():
+                    shared.idle.value -= 1
+
+        # the batch from the queue is done once everything it led to is searched
+        heapq.heapify(heap)
+        while heap:
+            risk, index = heapq.heappop(heap)
+            if risk > best[index] or risk >= bound.value:
+                # another path got here (or to the end) with less risk
+                continue
+            if risk > fronts[worker]:
+                shared.advance(fronts, worker, risk)
+            else:
+                # picking up a donated batch can move a front back
+                fronts[worker] = risk
+            if risk > min(fronts) + slack:
+                with advanced:
+                    # checked again under the lock, so a notify can't be missed
+                    advanced.wait_for(lambda: risk <= min(fronts) + slack)
+            searched += 1
+            if searched % shared.DONATE_EVERY == 0 and shared.idle.value and heap:
+                shared.put(heap[1::2])
+                heap = heap[::2]
+                heapq.heapify(heap)
+
+            y, x = divmod(index, width)
+            for neighbor, inside in (
+                (index - width, y > 0),
+                (index - 1, x > 0),
+                (index + 1, x < last_x),
+                (index + width, y < last_y),
+            ):
+                if not inside:
+                    continue
+                new_risk = risk + risk_of(neighbor)
+                if new_risk >= best[neighbor]:
+                    continue
+                neighbor_y, neighbor_x = divmod(neighbor, width)
+                if new_risk + last_x - neighbor_x + last_y - neighbor_y >= bound.value:
+                    # every step to the end has a risk of at least 1
+                    continue
+                with locks[neighbor % stripes]:
+                    # a cell's risk is always more than its predecessor's, so
+                    # following them back from the end can't loop
+                    if new_risk >= best[neighbor]:
+                        continue
+                    best[neighbor] = new_risk
+                    previous[neighbor] = index
+                if neighbor == target:
+                    shared.improve_bound(new_risk)
+                    if verbose:
+                        print("Found new best path:", new_risk)
+                    continue
+                heapq.heappush(heap, (new_risk, neighbor))
+        shared.done()
 
-    best_path = sorted(results, key=attrgetter("score"))[0]
 
-    print()
-    print(datetime.now())
-    print()
+def part1_dijkstra(filename, *, algorithm: str = "dijkstra"):
+    """Dijkstra's algorithm (or A*, or from both ends) over the grid's indexes."""
+    grid = read_file(filename)
     if verbose:
-        best_path.draw(grid)
+        print(grid)
         print()
 
-    print("Overall best process:", best_path.score)
+    route = find_route(grid, algorithm)
+    if verbose:
+        route.draw(grid)
+        print()
+    print("Best score:", route.risk)
 
 
-def depth_first_subprocess(paths: list[Path], grid: Grid, que: Queue):
-    """Find the best path from the provided paths."""
-    best_path = None
+def find_route(grid: Grid | TiledGrid, algorithm: str) -> Route:
+    """The least risky path from the top left to bottom right.
 
-    paths = deque(paths)
-    count = 0
-    while len(paths) > 0:
-        count += 1
-        if count % 100000 == 0:
-            if best_path is None:
-                print(f"{len(paths)} (); ", end="", flush=True)
-            else:
-                print(f"{len(paths)} ({best_path.score}); ", end="", flush=True)
+    Cells are addressed by their index in the grid, and entering one costs its
+    risk. A* uses the Manhattan distance to the end as its estimate, since
+    every cell has a risk of at least 1.
 
-        path = paths.pop()
-        for point in grid.neighbors(path.end):
-            if point in path.nodes:
-                continue
-            new_path = path.copy()
-            new_path.add(point, grid)
-            if new_path.end == P(grid.width - 1, grid.height - 1):
-                # found the end
-                if best_path is None or new_path.score < best_path.score:
-                    if verbose:
-                        print("Found new best path:", new_path.score)
-                    best_path = new_path
-                continue
-            elif best_path is not None and new_path.score >= best_path.score:
-                continue
-            paths.append(new_path)
+    """
+    neighbors = GridNeighbors(grid.width, grid.height)
+    target = grid.width * grid.height - 1
+    risk_of = grid.risk
+
+    def cost(_index: int, neighbor: int) -> int:
+        return risk_of(neighbor)
+
+    if algorithm == "bidirectional":
+        found = bidirectional_dijkstra(neighbors, 0, target, cost)
+        if found is None:
+            raise ValueError("The end can't be reached")
+        return Route(*found)
+    heuristic = manhattan(grid.width, target) if algorithm == "astar" else None
+    result = astar(neighbors, [0], cost, heuristic, target=target, predecessors=True)
+    if result.distance(target) is None:
+        raise ValueError("The end can't be reached")
+    return Route.from_predecessors(result.predecessors, target, result.distance(target))
+
+
+def part2(filename, *, tiles: int = 5, algorithm: str = "dijkstra"):
+    """The least risky path through the full (tiled) cave."""
+    grid = TiledGrid(read_file(filename), tiles)
+    if verbose:
+        print(grid)
+        print()
 
-    print("Best score for process:", best_path.score)
-    que.put(best_path)
+    route = find_route(grid, algorithm)
+    if verbose:
+        route.draw(grid)
+        print()
+    print("Best score:", route.risk)
 
 
-def part2(filename):
-    pass
+def part2_parallel(filename, *, tiles: int = 5, jobs: int | None = None):
+    grid = TiledGrid(read_file(filename), tiles)
+    print("Best score:", parallel_best_route(grid, jobs=jobs).risk)
 
 
 def read_file(filename) -> Grid:
@@ -268,5 +537,29 @@ def read_file(filename) -> Grid:
         return Grid.from_rows(([int(val) for val in line.strip()] for line in f))
 
 
+SAMPLE = """\
+1163751742
+1381373672
+2136511328
+3694931569
+7463417111
+1319128137
+1359912421
+3125421639
+1293138521
+2311944581
+"""
+
+
+def test_parallel_best_route():
+    grid = Grid.from_rows([int(val) for val in line] for line in SAMPLE.split())
+    assert parallel_best_route(grid, jobs=2).risk == 40
+    assert parallel_best_route(TiledGrid(grid, 5), jobs=2).risk == 315
+    assert find_route(grid, "dijkstra").risk == 40
+    # the start is already the end
+    assert parallel_best_route(Grid(1, 1, [5]), jobs=2) == Route(0, [0])
+    assert find_route(Grid(1, 1, [5]), "astar").risk == 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,151 +1,293 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [-v]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory] [--pure-python]
+
+The forest is surveyed with NumPy when it's installed; to compare that with
+the pure Python engines, run ``python -c "import day08; day08.compare_engines()"``.
 
 """
 
 from __future__ import annotations
 
 import sys
-from argparse import ArgumentParser
-from collections.abc import Iterator
+import time
 from dataclasses import dataclass
 from functools import cached_property
-from pathlib import Path
 
 import pytest
+from utils import Grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from aoc import template
+from aoc.inputs import MappedInput, lines
 
 verbose = False
+pure_python = False
 
 
 @dataclass
 class Trees:
-    # this is a list of rows
-    rows: list[list[int]]
+    grid: Grid
 
     @cached_property
     def size(self) -> int:
-        return len(self.rows)
+        return self.grid.height
+
+    @cached_property
+    def visible(self) -> bytearray:
+        """Whether each tree (by index) is visible from outside the forest.
+
+        Every row and column is swept once in each direction, tracking the
+        tallest tree so far, rather than checking every tree's four lines of
+        sight.
+
+        """
+        heights = self.grid.values
+        visible = bytearray(len(heights))
+        for line in self._lines():
+            tallest = -1
+            for index in line:
+                tree = heights[index]
+                if tree > tallest:
+                    visible[index] = 1
+                    tallest = tree
+        return visible
+
+    @cached_property
+    def scores(self) -> list[int]:
+        """The scenic score of each tree (by index).
+
+        Like `visible`, this sweeps every row and column in each direction. A
+        sweep keeps a stack of the trees that aren't hidden behind a later,
+        taller one, whose heights never increase: after popping the shorter
+        ones, the top of the stack is the tree that blocks the view back
+        along the line.
+
+        """
+        heights = self.grid.values
+        scores = [1] * len(heights)
+        for line in self._lines():
+            stack_heights = []
+            stack_positions = []
+            for position, index in enumerate(line):
+                tree = heights[index]
+                while stack_heights and stack_heights[-1] < tree:
+                    stack_heights.pop()
+                    stack_positions.pop()
+                # the edge is at position 0
+                scores[index] *= position - (
+                    stack_positions[-1] if stack_positions else 0
+                )
+                stack_heights.append(tree)
+                stack_positions.append(position)
+        return scores
+
+    def _lines(self) -> list[range]:
+        """The indexes along every row and column, in both directions."""
+        width, height = self.grid.width, self.grid.height
+        lines = []
+        for row in range(height):
+            line = range(row * width, (row + 1) * width)
+            lines += (line, line[::-1])
+        for column in range(width):
+            line = range(column, width * height, width)
+            lines += (line, line[::-1])
+        return lines
 
     def is_visible(self, row: int, column: int) -> bool:
         if row == 0 or column == 0 or row == self.size - 1 or column == self.size - 1:
             # outer edge
             return True
 
-        tree_height = self.rows[row][column]
-        # check row
-        for c in range(0, column):
-            if self.rows[row][c] >= tree_height:
-                break
-        else:
-            return True
-        for c in range(column + 1, self.size):
-            if self.rows[row][c] >= tree_height:
-                break
-        else:
-            return True
-        # check column
-        for r in range(0, row):
-            if self.rows[r][column] >= tree_height:
-                break
-        else:
-            return True
-        for r in range(row + 1, self.size):
-            if self.rows[r][column] >= tree_height:
-                break
-        else:
-            return True
+        heights = self.grid.values
+        index = row * self.size + column
+        tree_height = heights[index]
+        for stop, step in self._directions(row, column):
+            for i in range(index + step, stop, step):
+                if heights[i] >= tree_height:
+                    break
+            else:
+                return True
 
         return False
 
     def scenic_score(self, row: int, column: int) -> int:
-        up = self._look_up(row, column)
-        left = self._look_left(row, column)
-        down = self._look_down(row, column)
-        right = self._look_right(row, column)
-        score = up * down * left * right
+        heights = self.grid.values
+        index = row * self.size + column
+        tree_height = heights[index]
+        score = 1
+        for stop, step in self._directions(row, column):
+            distance = 0
+            for i in range(index + step, stop, step):
+                distance += 1
+                if heights[i] >= tree_height:
+                    break
+            score *= distance
         return score
 
-    def _look_up(self, row: int, column: int) -> int:
-        score = 0
-        tree_height = self.rows[row][column]
-        for r in range(row - 1, -1, -1):
-            score += 1
-            if self.rows[r][column] >= tree_height:
-                break
-        return score
-
-    def _look_down(self, row: int, column: int) -> int:
-        score = 0
-        tree_height = self.rows[row][column]
-        for r in range(row + 1, self.size, 1):
-            score += 1
-            if self.rows[r][column] >= tree_height:
-                break
-        return score
-
-    def _look_left(self, row: int, column: int) -> int:
-        score = 0
-        tree_height = self.rows[row][column]
-        for c in range(column - 1, -1, -1):
-            score += 1
-            if self.rows[row][c] >= tree_height:
-                break
-        return score
-
-    def _look_right(self, row: int, column: int) -> int:
-        score = 0
-        tree_height = self.rows[row][column]
-        for c in range(column + 1, self.size, 1):
-            score += 1
-            if self.rows[row][c] >= tree_height:
-                break
-        return score
+    def _directions(self, row: int, column: int) -> tuple[tuple[int, int], ...]:
+        """The (stop, step) of the ranges of indexes looking up/left/right/down."""
+        size = self.size
+        start_of_row = row * size
+        return (
+            (column - size, -size),
+            (start_of_row - 1, -1),
+            (start_of_row + size, 1),
+            (size * size + column, size),
+        )
+
+
+def _numpy_heights(grid: Grid):
+    # room for -1, before the edge
+    heights = np.frombuffer(grid.values, dtype=np.uint8).astype(np.int16)
+    return heights.reshape(grid.height, grid.width)
+
+
+def _numpy_directions():
+    """How to index a 2D array to look back along each direction.
+
+    Each direction looks back towards the start of `axis`, and flipping the
+    arrays the same way makes the results land in the right places. `head`
+    and `tail` slice everything but the last, and everything but the first,
+    along it.
+
+    """
+    for axis, flip in ((1, False), (1, True), (0, False), (0, True)):
+        order = (slice(None), slice(None, None, -1 if flip else 1))
+        if axis == 0:
+            order = order[::-1]
+        head = (slice(None), slice(None, -1))[1 - axis :]
+        tail = (slice(None), slice(1, None))[1 - axis :]
+        yield axis, order, head, tail
+
+
+def visible_numpy(grid: Grid):
+    """`Trees.visible`, as a 2D array, computed a whole row or column at a time.
+
+    Each tree is compared with the cumulative maximum of the trees before it.
+
+    """
+    heights = _numpy_heights(grid)
+    visible = np.zeros(heights.shape, dtype=bool)
+    mask = np.empty(heights.shape, dtype=bool)
+    before = np.empty(heights.shape, dtype=np.int16)
+    for axis, order, head, tail in _numpy_directions():
+        view, mask_view, before_view = heights[order], mask[order], before[order]
+        before_view[tail[:-1] + (slice(0, 1),)] = -1
+        np.maximum.accumulate(view[head], axis=axis, out=before_view[tail])
+        np.greater(view, before_view, out=mask_view)
+        visible[order] |= mask_view
+    return visible
+
+
+def scores_numpy(grid: Grid):
+    """`Trees.scores`, as a 2D array, computed a whole row or column at a time.
+
+    The position of the last tree at least as tall as each height is carried
+    along with a cumulative maximum, and each tree takes the one for its own
+    height.
+
+    """
+    heights = _numpy_heights(grid)
+    # positions along a row or column, as small as they fit
+    index_type = np.int16 if max(heights.shape) <= np.iinfo(np.int16).max else np.int32
+    scores = np.ones(heights.shape, dtype=np.int64)
+    tallest = int(heights.max(initial=0))
+    # working space for each tree, reused for every height and direction
+    mask = np.empty(heights.shape, dtype=bool)
+    candidates = np.empty(heights.shape, dtype=index_type)
+    blockers = np.empty(heights.shape, dtype=index_type)
+    distances = np.empty(heights.shape, dtype=index_type)
+
+    for axis, order, head, tail in _numpy_directions():
+        view, mask_view = heights[order], mask[order]
+        candidates_view, blockers_view = candidates[order], blockers[order]
+        distances_view = distances[order]
+        shape = [1, 1]
+        shape[axis] = heights.shape[axis]
+        positions = np.arange(heights.shape[axis], dtype=index_type).reshape(shape)
+
+        blockers_view[tail[:-1] + (slice(0, 1),)] = 0
+        for height in range(tallest + 1):
+            # the last position (so far) with a tree at least this tall
+            np.greater_equal(view, height, out=mask_view)
+            np.multiply(mask_view, positions, out=candidates_view)
+            np.maximum.accumulate(
+                candidates_view[head], axis=axis, out=blockers_view[tail]
+            )
+            np.equal(view, height, out=mask_view)
+            np.subtract(positions, blockers_view, out=distances_view, where=mask_view)
+        scores[order] *= distances_view
+    return scores
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
-
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
+    return template.main(
+        __name__,
+        mapped_input=True,
+        switches={"pure_python": "don't use NumPy, even if it's installed"},
+    )
 
 
-def part1(puzzle_input: str):
+def part1(puzzle_input: str | MappedInput):
     trees = parse_input(puzzle_input)
-    visible_count = 0
-    for row in range(0, trees.size):
-        for col in range(0, trees.size):
-            if trees.is_visible(row, col):
-                visible_count += 1
-    return visible_count
+    if np is not None and not pure_python:
+        return int(visible_numpy(trees.grid).sum())
+    return sum(trees.visible)
 
 
-def part2(puzzle_input: str):
+def part2(puzzle_input: str | MappedInput):
     trees = parse_input(puzzle_input)
-    scores = []
-    for row in range(0, trees.size):
-        for col in range(0, trees.size):
-            scores.append(trees.scenic_score(row, col))
-    return sorted(scores)[-1]
-
-
-def parse_input(puzzle_input: str) -> Trees:
-    rows = []
-    for line in puzzle_input.splitlines():
-        rows.append([int(t) for t in line])
-    trees = Trees(rows)
+    if np is not None and not pure_python:
+        return int(scores_numpy(trees.grid).max())
+    return max(trees.scores)
+
+
+def compare_engines(sizes=(50, 200, 1000), *, seed: int = 0):
+    """Time the ways of surveying generated forests of each size.
+
+    Checking each tree's lines of sight is skipped for the larger forests.
+
+    """
+    # only needed here, so importing the solution doesn't load the generators
+    from aoc.generators import generate
+
+    print(f"{'Size':>6}  {'Per tree':>10}  {'Sweeps':>10}  {'NumPy':>10}")
+    for size in sizes:
+        forest = list(generate(2022, 8, size, seed=seed))
+        timings = []
+
+        def per_tree(trees: Trees):
+            for row in range(trees.size):
+                for column in range(trees.size):
+                    trees.is_visible(row, column)
+                    trees.scenic_score(row, column)
+
+        for engine, enabled in (
+            (per_tree, size <= 200),
+            (lambda trees: (trees.visible, trees.scores), True),
+            (
+                lambda trees: (visible_numpy(trees.grid), scores_numpy(trees.grid)),
+                np is not None,
+            ),
+        ):
+            if not enabled:
+                timings.append("-")
+                continue
+            trees = Trees(Grid.from_digits(forest))
+            start = time.perf_counter()
+            engine(trees)
+            timings.append(f"{time.perf_counter() - start:.3f}s")
+        print(f"{size:>6}", *(f"{timing:>10}" for timing in timings), sep="  ")
+
+
+def parse_input(puzzle_input: str | MappedInput) -> Trees:
+    trees = Trees(Grid.from_digits(lines(puzzle_input)))
     if verbose:
         print(trees)
     return trees
@@ -175,5 +317,31 @@ def test_solutions(func, input_, expected):
     assert func(input_) == expected
 
 
+@pytest.mark.skipif(np is None, reason="NumPy isn't installed")
+def test_survey_numpy():
+    import random
+
+    rng = random.Random(25)
+    forest = ["".join(str(rng.randint(0, 9)) for _ in range(9)) for _ in range(7)]
+    trees = Trees(Grid.from_digits(forest))
+    assert visible_numpy(trees.grid).ravel().tolist() == list(trees.visible)
+    assert scores_numpy(trees.grid).ravel().tolist() == trees.scores
+
+
+def test_survey():
+    """The sweeps agree with checking each tree's lines of sight."""
+    import random
+
+    rng = random.Random(8)
+    forest = ["".join(str(rng.randint(0, 9)) for _ in range(12)) for _ in range(12)]
+    trees = Trees(Grid.from_digits(forest))
+    visible, scores = trees.visible, trees.scores
+    for row in range(trees.size):
+        for column in range(trees.size):
+            index = row * trees.size + column
+            assert visible[index] == trees.is_visible(row, column)
+            assert scores[index] == trees.scenic_score(row, column)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [--verbose]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory]
 
 """
 
@@ -9,13 +9,14 @@ from __future__ import annotations
 
 import enum
 import sys
-from argparse import ArgumentParser
 from collections.abc import Iterator
-from dataclasses import dataclass
-from pathlib import Path
 
 import pytest
 
+from aoc import template
+from aoc.inputs import MappedInput, lines
+from aoc.point import Point
+
 verbose = False
 
 
@@ -26,29 +27,27 @@ class Direction(enum.Enum):
     RIGHT = "R"
 
 
-@dataclass(frozen=True)
-class Point:
+class Knot(Point):
     """Coordinate system with 0,0 in lower left."""
 
-    x: int
-    y: int
+    __slots__ = ()
 
-    def copy(self) -> Point:
-        return Point(self.x, self.y)
+    def copy(self) -> Knot:
+        return Knot(self.x, self.y)
 
-    def move_up(self) -> Point:
-        return Point(self.x, self.y + 1)
+    def move_up(self) -> Knot:
+        return Knot(self.x, self.y + 1)
 
-    def move_right(self) -> Point:
-        return Point(self.x + 1, self.y)
+    def move_right(self) -> Knot:
+        return Knot(self.x + 1, self.y)
 
-    def move_down(self) -> Point:
-        return Point(self.x, self.y - 1)
+    def move_down(self) -> Knot:
+        return Knot(self.x, self.y - 1)
 
-    def move_left(self) -> Point:
-        return Point(self.x - 1, self.y)
+    def move_left(self) -> Knot:
+        return Knot(self.x - 1, self.y)
 
-    def check_adjacent(self, other: Point) -> bool:
+    def check_adjacent(self, other: Knot) -> bool:
         """See if two points are adjacent."""
         if other.x < self.x - 1 or self.x + 1 < other.x:
             return False
@@ -56,7 +55,7 @@ class Point:
             return False
         return True
 
-    def follow(self, other: Point) -> Point:
+    def follow(self, other: Knot) -> Knot:
         """Move to follow the other point."""
         if self.check_adjacent(other):
             return self
@@ -73,26 +72,12 @@ class Point:
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
+    return template.main(__name__, mapped_input=True)
 
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
-
-
-def part1(puzzle_input: str):
-    head = Point(0, 0)
-    tail = Point(0, 0)
+
+def part1(puzzle_input: str | MappedInput):
+    head = Knot(0, 0)
+    tail = Knot(0, 0)
     visited = set()
 
     for instruction in parse_input(puzzle_input):
@@ -120,8 +105,8 @@ def part1(puzzle_input: str):
     return len(visited)
 
 
-def part2(puzzle_input: str):
-    rope = [Point(0, 0) for _ in range(10)]
+def part2(puzzle_input: str | MappedInput):
+    rope = [Knot(0, 0) for _ in range(10)]
     visited = {rope[9]}
 
     def update_rope(direction_):
@@ -147,8 +132,8 @@ def part2(puzzle_input: str):
     return len(visited)
 
 
-def parse_input(puzzle_input: str) -> Iterator[tuple[Direction, int]]:
-    for line in puzzle_input.splitlines():
+def parse_input(puzzle_input: str | MappedInput) -> Iterator[tuple[Direction, int]]:
+    for line in lines(puzzle_input):
         direction, distance = line.split()
         yield Direction(direction), int(distance)
 
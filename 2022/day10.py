@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [--verbose]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory]
 
 """
 
@@ -9,35 +9,22 @@ from __future__ import annotations
 
 import itertools
 import sys
-from argparse import ArgumentParser
 from collections.abc import Iterator
 from dataclasses import dataclass
-from pathlib import Path
 
 import pytest
 
+from aoc import template
+from aoc.inputs import MappedInput, lines
+
 verbose = False
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
-
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
+    return template.main(__name__, mapped_input=True)
 
 
-def part1(puzzle_input: str):
+def part1(puzzle_input: str | MappedInput):
     register = 1
     current_instruction = None
     instructions = parse_input(puzzle_input)
@@ -58,7 +45,7 @@ def part1(puzzle_input: str):
     return signal_strength
 
 
-def part2(puzzle_input: str):
+def part2(puzzle_input: str | MappedInput):
     register = 1
     current_instruction = None
     instructions = parse_input(puzzle_input)
@@ -83,8 +70,8 @@ def part2(puzzle_input: str):
     return display
 
 
-def parse_input(puzzle_input: str):
-    yield from puzzle_input.splitlines()
+def parse_input(puzzle_input: str | MappedInput):
+    yield from lines(puzzle_input)
 
 
 SAMPLE = """
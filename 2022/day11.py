@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [--verbose]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory]
 
 """
 
@@ -10,15 +10,15 @@ from __future__ import annotations
 import math
 import re
 import sys
-from argparse import ArgumentParser
 from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from operator import attrgetter
-from pathlib import Path
 
 import pytest
 
+from aoc import template
+
 verbose = False
 
 
@@ -34,21 +34,7 @@ class Monkey:
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
-
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
+    return template.main(__name__)
 
 
 def part1(puzzle_input: str):
@@ -1,121 +1,164 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [--verbose]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory] [--bidirectional]
 
 """
 
 from __future__ import annotations
 
 import sys
-from argparse import ArgumentParser
-from collections import deque
-from collections.abc import Iterator
-from dataclasses import dataclass
-from pathlib import Path
+from array import array
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
 from string import ascii_lowercase
 
 import pytest
 from utils import Grid, Point
 
+from aoc import template
+from aoc.inputs import MappedInput, lines
+from aoc.search import UNREACHED, bfs, bidirectional_bfs
+
 verbose = False
+bidirectional = False
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
-
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
+    return template.main(
+        __name__,
+        mapped_input=True,
+        switches={"bidirectional": "search part 1 from both ends at once"},
+    )
 
 
-def part1(puzzle_input: str):
+def part1(puzzle_input: str | MappedInput):
     terrain = parse_input(puzzle_input)
 
-    starting_point = terrain.find("S")
+    starting_point = terrain.find_index("S")
+    ending_point = terrain.find_index("E")
     if verbose:
-        print("Starting point:", starting_point)
-    elevation = {letter: score for score, letter in enumerate(ascii_lowercase)}
-    elevation["S"] = elevation["a"]
-    elevation["E"] = elevation["z"]
-
-    points_visited = {starting_point: 0}
-    next_points = deque([starting_point])
-
-    while next_points:
-        point = next_points.pop()
-        cost = points_visited[point] + 1
-        height = elevation[terrain[point]]
-        for neighbor in terrain.neighbors(point):
-            if elevation[terrain[neighbor]] > height + 1:
-                continue
-            if neighbor in points_visited and points_visited[neighbor] <= cost:
-                continue
-            points_visited[neighbor] = cost
-            next_points.append(neighbor)
-
-    ending_point = terrain.find("E")
-    return points_visited.get(ending_point)
-
-
-def part2(puzzle_input: str):
+        print("Starting point:", terrain.point(starting_point))
+    elevation = elevations(terrain)
+
+    def climbable(point: int, neighbor: int) -> bool:
+        return elevation[neighbor] <= elevation[point] + 1
+
+    if bidirectional:
+        return bidirectional_bfs(
+            terrain.neighbor_table(), starting_point, ending_point, passable=climbable
+        )
+    return bfs(
+        terrain.neighbor_table(),
+        [starting_point],
+        passable=climbable,
+        target=ending_point,
+    ).distance(ending_point)
+
+
+def part2(puzzle_input: str | MappedInput):
     terrain = parse_input(puzzle_input)
-    starting_point = terrain.find("S")
     if verbose:
-        print("Starting point:", starting_point)
-    elevation = {letter: score for score, letter in enumerate(ascii_lowercase)}
-    elevation["S"] = elevation["a"]
-    elevation["E"] = elevation["z"]
-
-    shortest_trail = None
-    starting_points = [terrain.find("S")]
-    starting_points += terrain.find_all("a")
-    for starting_point in starting_points:
-        points_visited = {starting_point: 0}
-        next_points = deque([starting_point])
-
-        while next_points:
-            point = next_points.pop()
-            cost = points_visited[point] + 1
-            if shortest_trail is not None and cost > shortest_trail:
-                continue
-            height = elevation[terrain[point]]
-            for neighbor in terrain.neighbors(point):
-                if terrain[neighbor] in {"S", "a"}:
-                    # never enter the lowest level
-                    continue
-                if elevation[terrain[neighbor]] > height + 1:
-                    continue
-                if neighbor in points_visited and points_visited[neighbor] <= cost:
-                    continue
-                points_visited[neighbor] = cost
-                next_points.append(neighbor)
-
-        ending_point = terrain.find("E")
-        if ending_point not in points_visited:
-            continue
-        trail_length = points_visited[ending_point]
-        if shortest_trail is None:
-            shortest_trail = trail_length
-        elif trail_length < shortest_trail:
-            shortest_trail = trail_length
-
-    return shortest_trail
-
-
-def parse_input(puzzle_input: str) -> Grid:
-    elevations = [list(line) for line in puzzle_input.splitlines()]
-    return Grid(elevations)
+        print("Ending point:", terrain.find("E"))
+    elevation = elevations(terrain)
+
+    # walk down from the end (so each step can be at most 1 lower), which
+    # finds the distance from every cell in one search
+    distances = bfs(
+        terrain.neighbor_table(),
+        [terrain.find_index("E")],
+        passable=lambda point, neighbor: elevation[point] <= elevation[neighbor] + 1,
+    ).distances
+    trails = [
+        distance
+        for distance, height in zip(distances, elevation)
+        if height == 0 and distance != UNREACHED
+    ]
+    return min(trails, default=None)
+
+
+class TrailMap:
+    """Answer many "shortest hike from here to there" questions about one terrain.
+
+    The distances from each source asked about are found with one search and
+    kept (4 bytes a cell) until they're the least recently used and the
+    kept maps take more than `max_bytes`, so repeated sources are lookups.
+
+    """
+
+    def __init__(self, terrain: Grid, *, max_bytes: int = 64 * 1024 * 1024):
+        self.terrain = terrain
+        self.max_bytes = max_bytes
+        self._elevation = elevations(terrain)
+        self._maps: OrderedDict[int, array] = OrderedDict()
+        self._bytes = 0
+
+    @classmethod
+    def from_input(cls, puzzle_input: str | MappedInput, **kwargs) -> TrailMap:
+        return cls(parse_input(puzzle_input), **kwargs)
+
+    def _index(self, point: Point | int) -> int:
+        return point if isinstance(point, int) else self.terrain.index(point)
+
+    def distances_from(self, source: Point | int) -> array:
+        """The length of the shortest hike from `source` to every cell (-1 if none)."""
+        source = self._index(source)
+        if source in self._maps:
+            self._maps.move_to_end(source)
+            return self._maps[source]
+
+        elevation = self._elevation
+        distances = array(
+            "i",
+            bfs(
+                self.terrain.neighbor_table(),
+                [source],
+                passable=lambda point, neighbor: elevation[neighbor]
+                <= elevation[point] + 1,
+            ).distances,
+        )
+        self._maps[source] = distances
+        self._bytes += distances.itemsize * len(distances)
+        while self._bytes > self.max_bytes and len(self._maps) > 1:
+            _source, evicted = self._maps.popitem(last=False)
+            self._bytes -= evicted.itemsize * len(evicted)
+        return distances
+
+    def distance(self, source: Point | int, target: Point | int) -> int | None:
+        distance = self.distances_from(source)[self._index(target)]
+        return None if distance == UNREACHED else distance
+
+    def distances(
+        self, queries: Iterable[tuple[Point | int, Point | int]]
+    ) -> list[int | None]:
+        """Answer (source, target) queries, searching from each source only once."""
+        queries = [
+            (self._index(source), self._index(target)) for source, target in queries
+        ]
+        answers = [None] * len(queries)
+        by_source = defaultdict(list)
+        for position, (source, target) in enumerate(queries):
+            by_source[source].append((position, target))
+        for source, targets in by_source.items():
+            distances = self.distances_from(source)
+            for position, target in targets:
+                if distances[target] != UNREACHED:
+                    answers[position] = distances[target]
+        return answers
+
+
+def parse_input(puzzle_input: str | MappedInput) -> Grid:
+    return Grid.from_text(lines(puzzle_input))
+
+
+ELEVATIONS = bytes.maketrans(
+    b"SE" + ascii_lowercase.encode(), bytes([0, 25]) + bytes(range(26))
+)
+
+
+def elevations(terrain: Grid) -> bytes:
+    """The height of each cell (by index), from 0 (a) to 25 (z)."""
+    return bytes(terrain.values).translate(ELEVATIONS)
 
 
 SAMPLE = """
@@ -142,5 +185,21 @@ def test_solutions(func, input_, expected):
     assert func(input_) == expected
 
 
+def test_trail_map():
+    trails = TrailMap.from_input(SAMPLE, max_bytes=100)
+    start, end = Point(0, 0), Point(5, 2)
+    assert trails.distance(start, end) == 31
+    queries = [(start, end), (end, start), (Point(0, 4), end)]
+    assert trails.distances(queries) == [31, 7, 29]
+    # each map is 160 bytes, so only the latest is kept
+    assert list(trails._maps) == [trails.terrain.index(Point(0, 4))]
+    assert trails.distance(Point(0, 4), end) == 29
+
+
+def test_bidirectional(monkeypatch):
+    monkeypatch.setattr(sys.modules[__name__], "bidirectional", True)
+    assert part1(SAMPLE) == 31
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Template for Advent of Code solution in Python.
 
-Usage: ./day##.py [--verbose]
+Usage: ./day##.py [--verbose] [--profile] [--trace-memory]
 
 """
 
@@ -9,16 +9,18 @@ from __future__ import annotations
 
 import json
 import sys
-from argparse import ArgumentParser
 from collections.abc import Iterator
 from dataclasses import dataclass
 from itertools import zip_longest
-from pathlib import Path
 from typing import NamedTuple
 
 import pytest
 
+from aoc import template
+from aoc.trace import Tracer
+
 verbose = False
+tracer = Tracer()
 
 
 class ValidPacket(Exception):
@@ -58,9 +60,8 @@ class Packet:
         return True
 
 
+@tracer.traced("compare")
 def validate(left: list, right: list):
-    if verbose:
-        print(f"Comparing {left} to {right}")
     for left_value, right_value in zip_longest(left, right):
         match (left_value, right_value):
             case (int() as a, int() as b):
@@ -83,21 +84,7 @@ def validate(left: list, right: list):
 
 
 def main():
-    parser = ArgumentParser()
-    parser.add_argument("--verbose", "-v", action="store_true")
-
-    global verbose
-    args = parser.parse_args()
-    if args.verbose:
-        verbose = True
-
-    # the download script doesn't add the leading 0
-    day = int(Path(__file__).stem.removeprefix("day"))
-    input_file = Path(f"day{day}-input.txt")
-    print(f"Reading input from {input_file}")
-    puzzle_input = input_file.read_text()
-    print(f"Day #{day} part 1 solution:", part1(puzzle_input))
-    print(f"Day #{day} part 2 solution:", part2(puzzle_input))
+    return template.main(__name__)
 
 
 def part1(puzzle_input: str):
@@ -1,96 +1,183 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 
+from aoc.point import Point
+from aoc.search import GridNeighbors
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
+
+@dataclass
+class Grid:
+    """A rectangular grid stored as one flat, row-major sequence.
+
+    Cells can be addressed by `Point` or, in hot loops, by their integer index
+    (``y * width + x``) into `values`. Text grids store the character codes in
+    a `bytearray`, but `Point` lookups still return the characters.
+
+    """
+
+    width: int
+    height: int
+    values: bytearray | array | list
+    text: bool = False
+
+    def __post_init__(self):
+        width = self.width
+        # (delta x, delta y, delta index) for each neighbor
+        self.offsets4 = ((0, -1, -width), (-1, 0, -1), (1, 0, 1), (0, 1, width))
+        self.offsets8 = self.offsets4 + (
+            (-1, -1, -width - 1),
+            (1, -1, -width + 1),
+            (-1, 1, width - 1),
+            (1, 1, width + 1),
+        )
 
     @classmethod
-    def load(cls, value: str) -> Point:
-        return Point(*(int(c) for c in value.split(",")))
+    def from_rows(cls, rows: Iterable[Sequence]) -> Grid:
+        """Create a grid of arbitrary values (stored in a list)."""
+        values = []
+        width = None
+        height = 0
+        for row in rows:
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError("Rows need to have same length")
+            values.extend(row)
+            height += 1
+        return cls(width or 0, height, values)
 
     @classmethod
-    def line(cls, begin: Point, end: Point) -> list[Point]:
-        """Create the list of points that make up a line.
-
-        Only cardinal directions are currently supported!
-
-        """
-        if begin == end:
-            return [begin]
-        if begin.y == end.y:
-            if begin.x < end.x:
-                delta = 1
-            else:
-                delta = -1
-            return [Point(x, begin.y) for x in range(begin.x, end.x + delta, delta)]
-        if begin.x == end.x:
-            if begin.y < end.y:
-                delta = 1
-            else:
-                delta = -1
-            return [Point(begin.x, y) for y in range(begin.y, end.y + delta, delta)]
-        return ValueError("Line must be horizontal or vertical.")
+    def from_text(cls, lines: Iterable[str]) -> Grid:
+        """Create a grid of characters."""
+        grid = cls._from_bytes(line.encode() for line in lines)
+        grid.text = True
+        return grid
 
+    @classmethod
+    def from_digits(cls, lines: Iterable[str]) -> Grid:
+        """Create a grid of single digit numbers."""
+        return cls._from_bytes(line.encode().translate(DIGIT_VALUES) for line in lines)
 
-@dataclass
-class Grid:
-    _values: list[list]  # rows of columns
+    @classmethod
+    def _from_bytes(cls, rows: Iterable[bytes]) -> Grid:
+        values = bytearray()
+        width = None
+        height = 0
+        for row in rows:
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError("Rows need to have same length")
+            values += row
+            height += 1
+        return cls(width or 0, height, values)
+
+    def __len__(self):
+        return self.width * self.height
+
+    def index(self, point: Point) -> int:
+        return point.y * self.width + point.x
+
+    def point(self, index: int) -> Point:
+        return Point(index % self.width, index // self.width)
+
+    def row(self, row: int) -> memoryview | list:
+        """A view of the raw values in a row."""
+        return self._view()[row * self.width : (row + 1) * self.width]
+
+    def column(self, column: int) -> memoryview | list:
+        """A view of the raw values in a column."""
+        return self._view()[column :: self.width]
+
+    def _view(self) -> memoryview | list:
+        if isinstance(self.values, list):
+            return self.values
+        return memoryview(self.values)
+
+    def encode(self, value) -> int:
+        """Convert a value to how it is stored in `values`."""
+        return ord(value) if self.text else value
+
+    def decode(self, value):
+        return chr(value) if self.text else value
+
+    def find_index(self, value) -> int | None:
+        try:
+            return self.values.index(self.encode(value))
+        except ValueError:
+            return None
 
-    @property
-    def width(self) -> int:
-        return len(self._values[0])
+    def find(self, value) -> Point | None:
+        index = self.find_index(value)
+        return None if index is None else self.point(index)
 
-    @property
-    def height(self):
-        return len(self._values)
+    def find_all_indexes(self, value) -> Iterator[int]:
+        value = self.encode(value)
+        return (index for index, cell in enumerate(self.values) if cell == value)
 
-    def row(self, row) -> list:
-        return self._values[row]
+    def find_all(self, value) -> Iterator[Point]:
+        return (self.point(index) for index in self.find_all_indexes(value))
 
-    def column(self, column) -> list:
-        return [row[column] for row in self._values]
+    def neighbor_table(self, *, diagonal: bool = False) -> GridNeighbors:
+        """The neighbor indexes of every cell, by index (see `GridNeighbors`)."""
+        return GridNeighbors(self.width, self.height, diagonal=diagonal)
 
-    def find(self, value) -> Point:
-        for point in self:
-            if self[point] == value:
-                return point
-
-    def find_all(self, value) -> Iterator[Point]:
-        for point in self:
-            if self[point] == value:
-                yield point
+    def neighbor_indexes(self, index: int, *, diagonal: bool = False) -> list[int]:
+        """The indexes of the neighbors of the cell at `index`."""
+        return list(self.neighbor_table(diagonal=diagonal)[index])
 
     def neighbors(self, point: Point, *, diagonal: bool = False) -> Iterator[Point]:
         """Yield the neighbors to a particular point."""
-        for delta in (-1, 1):
-            if 0 <= point.x + delta < self.width:
-                yield Point(point.x + delta, point.y)
-            if 0 <= point.y + delta < self.height:
-                yield Point(point.x, point.y + delta)
-
-        if diagonal:
-            for delta_x in (-1, 1):
-                if point.x + delta_x < 0 or point.x + delta_x >= self.width:
-                    continue
-                for delta_y in (-1, 1):
-                    if point.y + delta_y < 0 or point.y + delta_y >= self.height:
-                        continue
-                    yield Point(point.x + delta_x, point.y + delta_y)
+        for dx, dy, _delta in self.offsets8 if diagonal else self.offsets4:
+            if 0 <= point.x + dx < self.width and 0 <= point.y + dy < self.height:
+                yield Point(point.x + dx, point.y + dy)
 
     def __getitem__(self, item: Point):
-        try:
-            return self._values[item.y][item.x]
-        except IndexError:
-            raise IndexError(f"Point not in grid: {item}") from None
+        if not (0 <= item.x < self.width and 0 <= item.y < self.height):
+            raise IndexError(f"Point not in grid: {item}")
+        return self.decode(self.values[item.y * self.width + item.x])
+
+    def __setitem__(self, item: Point, value):
+        if not (0 <= item.x < self.width and 0 <= item.y < self.height):
+            raise IndexError(f"Point not in grid: {item}")
+        self.values[item.y * self.width + item.x] = self.encode(value)
 
     def __iter__(self):
         return (Point(x, y) for y in range(self.height) for x in range(self.width))
 
     def __str__(self):
-        output = ["".join(str(val) for val in row) for row in self._values]
+        if self.text:
+            return "\n".join(
+                bytes(self.row(row)).decode() for row in range(self.height)
+            )
+        output = [
+            "".join(str(val) for val in self.row(row)) for row in range(self.height)
+        ]
         return "\n".join(output)
+
+
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def test_grid():
+    grid = Grid.from_text(["Sab", "cdE"])
+    assert (grid.width, grid.height) == (3, 2)
+    assert grid.find("E") == Point(2, 1)
+    assert grid[Point(1, 0)] == "a"
+    assert grid.values[grid.index(Point(1, 0))] == ord("a")
+    assert list(grid.neighbors(Point(0, 0))) == [Point(1, 0), Point(0, 1)]
+    assert grid.neighbor_indexes(0) == [1, 3]
+    assert grid.neighbor_table()[4] == (1, 3, 5)
+    assert bytes(grid.column(1)) == b"ad"
+    assert str(grid) == "Sab\ncdE"
+
+
+def test_digit_grid():
+    grid = Grid.from_digits(["305", "251"])
+    assert list(grid.row(1)) == [2, 5, 1]
+    assert grid[Point(2, 0)] == 5
+    assert sorted(grid.neighbor_indexes(4, diagonal=True)) == [0, 1, 2, 3, 5]
+    assert str(grid) == "305\n251"
@@ -0,0 +1,5 @@
+"""Shared tooling for running the Advent of Code solutions.
+
+Run ``python -m aoc --help`` from the repository root.
+
+"""
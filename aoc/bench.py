@@ -0,0 +1,206 @@
+"""Benchmark the solutions and keep a history of the timings.
+
+Every measurement runs in a fresh process so that the peak RSS belongs to that
+one case. Results are appended to a JSON history file, keyed by git commit, and
+compared against the most recent run from a different commit.
+
+"""
+
+from __future__ import annotations
+
+import json
+import resource
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from aoc import generators
+from aoc.days import ROOT, Day, UnsupportedDay, get_part, solve, solver_style
+
+DEFAULT_HISTORY = ROOT / "benchmarks.json"
+
+
+@dataclass(frozen=True)
+class Case:
+    day: Day
+    part: int
+    name: str
+    input_file: Path | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.day.year}/{self.day.day:02d}/part{self.part}/{self.name}"
+
+
+@dataclass
+class Measurement:
+    wall: float
+    cpu: float
+    max_rss_kb: int
+
+
+def collect_cases(
+    days: list[Day], *, scales: list[int] = (), generated_dir: Path | None = None
+) -> list[Case]:
+    """Find the inputs available for each day: its SAMPLE and its puzzle input.
+
+    For each of `scales`, an input is also generated (into `generated_dir`).
+
+    """
+    cases = []
+    for day in days:
+        generated = {}
+        for scale in scales:
+            if (day.year, day.day) not in generators.GENERATORS:
+                continue
+            generated[scale] = generated_dir / f"{day.year}-day{day.day}-{scale}.txt"
+            generators.write_input(generated[scale], day.year, day.day, scale)
+        try:
+            module = day.load()
+        except Exception:
+            continue
+        for part in (1, 2):
+            try:
+                style = solver_style(get_part(module, part))
+            except UnsupportedDay:
+                continue
+            if style == "text" and hasattr(module, "SAMPLE"):
+                cases.append(Case(day, part, "sample"))
+            if day.input_file.exists():
+                cases.append(Case(day, part, "input", day.input_file))
+            for scale, input_file in generated.items():
+                cases.append(Case(day, part, f"scale{scale}", input_file))
+    return cases
+
+
+def measure(case: Case, repeat: int) -> Measurement:
+    """Time a case (this runs in its own process)."""
+    module = case.day.load()
+    puzzle_input = module.SAMPLE if case.input_file is None else None
+    wall = cpu = None
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        solve(module, case.part, case.input_file, puzzle_input)
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        if wall is None or wall_time < wall:
+            wall, cpu = wall_time, cpu_time
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return Measurement(wall, cpu, max_rss_kb)
+
+
+def run_benchmarks(cases: list[Case], *, repeat: int = 3) -> dict[str, Measurement]:
+    results = {}
+    # one case at a time, so the cases don't compete for the CPU
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        for case in cases:
+            try:
+                results[case.key] = executor.submit(measure, case, repeat).result()
+            except Exception as exc:
+                print(f"{case.key}: failed ({exc!r})")
+    return results
+
+
+def current_commit() -> str:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return output.stdout.strip()
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
+
+
+def save_history(path: Path, history: list[dict]):
+    path.write_text(json.dumps(history, indent=2) + "\n")
+
+
+def find_baseline(history: list[dict], commit: str, baseline: str | None = None):
+    """Return the run to compare against: `baseline` or the latest other commit."""
+    for run in reversed(history):
+        if baseline is not None:
+            if run["commit"] == baseline:
+                return run
+        elif run["commit"] != commit:
+            return run
+    return None
+
+
+def find_regressions(
+    previous: dict[str, dict],
+    current: dict[str, Measurement],
+    *,
+    threshold: float,
+    min_seconds: float = 0.005,
+) -> list[str]:
+    """List the cases whose wall time grew more than `threshold` (a fraction).
+
+    Cases faster than `min_seconds` in both runs are too noisy to compare.
+
+    """
+    regressions = []
+    for key, measurement in current.items():
+        if key not in previous:
+            continue
+        before = previous[key]["wall"]
+        if max(before, measurement.wall) < min_seconds:
+            continue
+        if measurement.wall > before * (1 + threshold):
+            regressions.append(
+                f"{key}: {before:.4f}s -> {measurement.wall:.4f}s"
+                f" (+{(measurement.wall / before - 1):.0%})"
+            )
+    return regressions
+
+
+def format_results(results: dict[str, Measurement]) -> str:
+    lines = [f"{'Case':<28}{'Wall':>10}{'CPU':>10}{'Peak RSS':>12}"]
+    for key, measurement in results.items():
+        lines.append(
+            f"{key:<28}{measurement.wall:>9.4f}s{measurement.cpu:>9.4f}s"
+            f"{measurement.max_rss_kb / 1024:>9.1f}MiB"
+        )
+    return "\n".join(lines)
+
+
+def test_find_regressions():
+    previous = {
+        "2022/12/part1/input": {"wall": 1.0, "cpu": 1.0, "max_rss_kb": 1},
+        "2022/12/part2/input": {"wall": 1.0, "cpu": 1.0, "max_rss_kb": 1},
+        "2022/12/part1/sample": {"wall": 0.001, "cpu": 0.001, "max_rss_kb": 1},
+    }
+    current = {
+        "2022/12/part1/input": Measurement(1.1, 1.1, 1),
+        "2022/12/part2/input": Measurement(1.5, 1.5, 1),
+        "2022/12/part1/sample": Measurement(0.003, 0.003, 1),
+        "2022/13/part1/input": Measurement(9.0, 9.0, 1),
+    }
+    regressions = find_regressions(previous, current, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("2022/12/part2/input")
+
+
+def test_find_baseline():
+    history = [{"commit": "a"}, {"commit": "b"}, {"commit": "c"}]
+    assert find_baseline(history, "c")["commit"] == "b"
+    assert find_baseline(history, "c", "a")["commit"] == "a"
+    assert find_baseline(history, "c", "z") is None
+
+
+def test_measure():
+    measurement = measure(Case(Day(2022, 12), 1, "sample"), repeat=1)
+    assert measurement.wall > 0
+    assert measurement.max_rss_kb > 0
@@ -0,0 +1,227 @@
+"""Remember answers, so re-running an unchanged day on the same input is instant.
+
+Answers are keyed by a hash of the input plus a hash of the day's source code
+(including helper modules like ``utils.py`` from the same directory and the
+shared ones like ``aoc.point``), so editing the solution invalidates its
+answers.
+
+The cache keeps about the `max_entries` most recently used answers.
+
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from aoc.days import ROOT
+
+DEFAULT_CACHE = ROOT / ".cache" / "answers"
+
+MISSING = object()
+
+# how far past `max_entries` the cache can grow before the oldest are evicted
+EVICT_OVER = 1.1
+
+# imported by the days, but they don't affect the answers
+HARNESS = {"aoc", "aoc.template"}
+
+
+def source_digest(module: ModuleType) -> str:
+    """Hash the module's source and the modules it uses that could change answers.
+
+    That's the modules it imports from its own directory and from the `aoc`
+    package (and in turn, theirs), apart from the command line harness. The
+    hash is kept until one of the files is modified.
+
+    """
+    paths = _source_paths(module.__name__, module.__file__)
+    stamps = []
+    for path in paths:
+        stat = path.stat()
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    cached = _digests.get(module.__name__)
+    if cached is not None and cached[0] == stamps:
+        return cached[1]
+    package = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for path in paths:
+        # only the file names within their directories, so the repo can be moved
+        digest.update(f"{path.parent == package}/{path.name}".encode())
+        digest.update(path.read_bytes())
+    _digests[module.__name__] = (stamps, digest.hexdigest())
+    return digest.hexdigest()
+
+
+# the last digest of each module, with the files' (mtime, size) it was made from
+_digests: dict[str, tuple[list[tuple[int, int]], str]] = {}
+
+
+@functools.cache
+def _source_paths(name: str, filename: str) -> list[Path]:
+    """The files `source_digest` hashes for the (imported) module `name`."""
+    directory = Path(filename).resolve().parent
+    package = Path(__file__).resolve().parent
+    paths = {Path(filename).resolve()}
+    pending = [sys.modules[name]]
+    while pending:
+        for value in vars(pending.pop()).values():
+            if isinstance(value, ModuleType):
+                imported = value
+            else:
+                imported = sys.modules.get(getattr(value, "__module__", None) or "")
+            filename = getattr(imported, "__file__", None)
+            if not filename or imported.__name__ in HARNESS:
+                continue
+            path = Path(filename).resolve()
+            if path.parent in (directory, package) and path not in paths:
+                paths.add(path)
+                pending.append(imported)
+    return sorted(paths)
+
+
+def input_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@dataclass
+class AnswerCache:
+    directory: Path = DEFAULT_CACHE
+    max_entries: int = 1000
+
+    def _path(self, source: str, part: int, input_: str) -> Path:
+        return self.directory / f"{source[:24]}-{part}-{input_[:24]}.json"
+
+    def get(self, source: str, part: int, input_: str):
+        """Return the cached answer, or `MISSING`."""
+        path = self._path(source, part, input_)
+        try:
+            answer = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return MISSING
+        # the modification time tracks when it was last used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process since it was read
+            pass
+        return answer
+
+    def put(self, source: str, part: int, input_: str, answer):
+        try:
+            data = json.dumps(answer)
+        except TypeError:
+            # only cache answers that survive the round trip
+            return
+        if json.loads(data) != answer:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(source, part, input_)
+        # written under a unique name and renamed, so readers never see half
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(data)
+        os.replace(temporary, path)
+        # counting the entries is cheap, unlike finding the oldest
+        if len(os.listdir(self.directory)) > self.max_entries * EVICT_OVER:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries beyond `max_entries`.
+
+        Other processes can be evicting (or reading) at the same time, so
+        entries that disappear along the way are skipped.
+
+        """
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        for _mtime, path in entries[: max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+
+def test_answer_cache(tmp_path):
+    cache = AnswerCache(tmp_path, max_entries=2)
+    assert cache.get("s", 1, "a") is MISSING
+    cache.put("s", 1, "a", 42)
+    cache.put("s", 2, "a", "\n##..\n")
+    assert cache.get("s", 1, "a") == 42
+    assert cache.get("s", 2, "a") == "\n##..\n"
+    assert cache.get("t", 1, "a") is MISSING
+
+    # the least recently used answer is evicted first
+    os.utime(cache._path("s", 2, "a"), (0, 0))
+    cache.put("s", 1, "b", 7)
+    assert cache.get("s", 2, "a") is MISSING
+    assert cache.get("s", 1, "a") == 42
+
+    # answers that can't round trip through JSON aren't cached
+    cache.put("s", 2, "b", (1, 2))
+    assert cache.get("s", 2, "b") is MISSING
+
+
+def test_concurrent_eviction(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(4) as executor:
+        futures = [
+            executor.submit(_churn, tmp_path, worker, 200) for worker in range(8)
+        ]
+        for future in futures:
+            future.result()
+    assert len(list(tmp_path.glob("*.json"))) <= 20 * EVICT_OVER
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def _churn(directory: Path, worker: int, count: int):
+    cache = AnswerCache(directory, max_entries=20)
+    for index in range(count):
+        cache.put("s", worker, str(index), index)
+        cache.get("s", worker, str(index))
+        cache.get("s", (worker + 1) % 8, str(index))
+
+
+def test_source_digest(tmp_path, monkeypatch):
+    import importlib
+
+    (tmp_path / "helper.py").write_text("def value():\n    return 1\n")
+    (tmp_path / "solver.py").write_text("from helper import value\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    solver = importlib.import_module("solver")
+    try:
+        before = source_digest(solver)
+        assert before == source_digest(solver)
+        (tmp_path / "helper.py").write_text("def value():\n    return 2\n")
+        assert source_digest(solver) != before
+    finally:
+        del sys.modules["solver"], sys.modules["helper"]
+
+
+def test_source_digest_shared_modules(monkeypatch):
+    from aoc import point, template
+    from aoc.days import Day
+
+    module = Day(2022, 9).load()
+    paths = _source_paths(module.__name__, module.__file__)
+    # the shared modules are hashed, but not the template that runs the day
+    assert Path(point.__file__).resolve() in paths
+    assert Path(template.__file__).resolve() not in paths
+
+    # the files are only read again once they change
+    before = source_digest(module)
+    reads = []
+    original = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda path: reads.append(path))
+    assert source_digest(module) == before
+    assert not reads
+    monkeypatch.setattr(Path, "read_bytes", original)
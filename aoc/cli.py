@@ -0,0 +1,162 @@
+"""Command line entry point: ``python -m aoc COMMAND``."""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from aoc import bench, daemon, fetch, generators, runner
+from aoc.days import ROOT, Day, discover
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(prog="python -m aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run solutions in parallel")
+    run_parser.add_argument("years", type=int, nargs="*", help="default: all years")
+    run_parser.add_argument("--day", "-d", type=int, action="append", dest="days")
+    run_parser.add_argument("--jobs", "-j", type=int, help="default: CPU count")
+    run_parser.add_argument(
+        "--no-cache", action="store_false", dest="cache", help="don't reuse answers"
+    )
+    run_parser.set_defaults(func=run)
+
+    bench_parser = commands.add_parser("bench", help="benchmark solutions")
+    bench_parser.add_argument("years", type=int, nargs="*", help="default: all years")
+    bench_parser.add_argument("--day", "-d", type=int, action="append", dest="days")
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument(
+        "--scale",
+        type=int,
+        action="append",
+        dest="scales",
+        default=[],
+        help="also benchmark a generated input of this scale",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="fail if a case is this much slower (0.25 = 25%%)",
+    )
+    bench_parser.add_argument("--history", type=Path, default=bench.DEFAULT_HISTORY)
+    bench_parser.add_argument("--baseline", help="commit to compare against")
+    bench_parser.add_argument(
+        "--no-save", action="store_false", dest="save", help="don't update history"
+    )
+    bench_parser.set_defaults(func=run_bench)
+
+    generate_parser = commands.add_parser("generate", help="generate a large input")
+    generate_parser.add_argument("year", type=int)
+    generate_parser.add_argument("day", type=int)
+    generate_parser.add_argument("--scale", type=int, required=True)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--output", "-o", type=Path, help="default: stdout")
+    generate_parser.set_defaults(func=generate)
+
+    fetch_parser = commands.add_parser("fetch", help="download puzzle inputs")
+    fetch_parser.add_argument("year", type=int)
+    fetch_parser.add_argument("days", type=int, nargs="*", help="default: all solved")
+    fetch_parser.add_argument("--jobs", "-j", type=int, default=4)
+    fetch_parser.add_argument("--offline", action="store_true", help="only use cache")
+    fetch_parser.add_argument("--base-url", default=fetch.BASE_URL)
+    fetch_parser.add_argument("--token-file", type=Path, default=ROOT / ".token")
+    fetch_parser.add_argument("--cache", type=Path, default=fetch.DEFAULT_CACHE)
+    fetch_parser.set_defaults(func=fetch_inputs)
+
+    daemon_parser = commands.add_parser("daemon", help="serve solutions warm")
+    daemon_parser.add_argument("--socket", type=Path, default=daemon.DEFAULT_SOCKET)
+    daemon_parser.set_defaults(func=lambda args: daemon.serve(args.socket))
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+def run(args):
+    days = list(discover(args.years, args.days))
+    if not days:
+        return "No solutions found"
+    start = time.perf_counter()
+    results = runner.run_days(days, jobs=args.jobs, use_cache=args.cache)
+    print(runner.format_table(results))
+    print()
+    print(f"Wall time: {time.perf_counter() - start:.3f}s")
+
+
+def run_bench(args):
+    with TemporaryDirectory() as generated_dir:
+        cases = bench.collect_cases(
+            list(discover(args.years, args.days)),
+            scales=args.scales,
+            generated_dir=Path(generated_dir),
+        )
+        if not cases:
+            return "Nothing to benchmark"
+        results = bench.run_benchmarks(cases, repeat=args.repeat)
+    print(bench.format_results(results))
+
+    history = bench.load_history(args.history)
+    commit = bench.current_commit()
+    baseline = bench.find_baseline(history, commit, args.baseline)
+    regressions = []
+    if baseline is not None:
+        print(f"\nComparing with {baseline['commit']} ({baseline['date']})")
+        regressions = bench.find_regressions(
+            baseline["results"], results, threshold=args.threshold
+        )
+
+    if args.save:
+        history.append(
+            {
+                "commit": commit,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "results": {key: asdict(value) for key, value in results.items()},
+            }
+        )
+        bench.save_history(args.history, history)
+
+    if regressions:
+        return "Regressions found:\n" + "\n".join(regressions)
+
+
+def generate(args):
+    try:
+        lines = generators.generate(args.year, args.day, args.scale, seed=args.seed)
+    except ValueError as exc:
+        return str(exc)
+    if args.output is not None:
+        generators.write_input(
+            args.output, args.year, args.day, args.scale, seed=args.seed
+        )
+        return
+    for line in lines:
+        sys.stdout.write(line + "\n")
+
+
+def fetch_inputs(args):
+    days = args.days or [day.day for day in discover([args.year])]
+    try:
+        token = fetch.read_token(args.token_file)
+    except FileNotFoundError:
+        return f"Session token not found: {args.token_file}"
+    fetcher = fetch.Fetcher(token, args.base_url, args.cache, offline=args.offline)
+    results = fetcher.fetch_many([(args.year, day) for day in days], jobs=args.jobs)
+
+    failed = False
+    for (year, day), content in results.items():
+        if isinstance(content, Exception):
+            print(f"{year} day {day}: {content}")
+            failed = True
+            continue
+        input_file = Day(year, day).input_file
+        if not input_file.exists() or input_file.read_bytes() != content:
+            input_file.write_bytes(content)
+        print(f"{year} day {day}: {input_file.relative_to(ROOT)}")
+    if failed:
+        return "Some inputs could not be fetched"
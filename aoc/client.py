@@ -0,0 +1,61 @@
+"""Thin client for the solver daemon (see `aoc.daemon`).
+
+Usage: python -m aoc.client YEAR DAY [PART] [--input FILE] [--no-cache]
+
+This deliberately only imports what it needs to talk to the daemon.
+
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import sys
+from pathlib import Path
+
+DEFAULT_SOCKET = Path(__file__).resolve().parent.parent / ".cache" / "solver.sock"
+
+
+def request(message: dict, socket_path: Path = DEFAULT_SOCKET) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def main(argv: list[str]):
+    # argparse alone would double the start up time of this
+    usage = __doc__.strip().splitlines()[2]
+    positional = []
+    message = {"cache": True}
+    arguments = iter(argv)
+    for arg in arguments:
+        if arg == "--input":
+            message["input"] = str(Path(next(arguments, "")).resolve())
+        elif arg == "--no-cache":
+            message["cache"] = False
+        elif arg.startswith("-") or not arg.isdigit():
+            return usage
+        else:
+            positional.append(int(arg))
+    if len(positional) not in (2, 3):
+        return usage
+    message["year"], message["day"] = year, day = positional[:2]
+    parts = positional[2:] or [1, 2]
+
+    for part in parts:
+        try:
+            response = request({**message, "part": part})
+        except (FileNotFoundError, ConnectionRefusedError):
+            return (
+                "The solver daemon isn't running (start it with: python -m aoc daemon)"
+            )
+        if response["error"]:
+            print(f"Day #{day} part {part} failed:", response["error"])
+        else:
+            print(f"Day #{day} part {part} solution:", response["answer"])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,128 @@
+"""Keep every day's module imported and solve requests sent over a Unix socket.
+
+Start it with ``python -m aoc daemon`` and send it work with the thin client,
+``python -m aoc.client YEAR DAY [PART]``, which skips the interpreter having
+to import the solutions (and pytest) on every run.
+
+Each request is one line of JSON::
+
+    {"year": 2022, "day": 12, "part": 1, "input": "/path/to/input", "cache": true}
+
+and is answered with one line of JSON::
+
+    {"answer": 31, "seconds": 0.001, "cached": false, "error": null}
+
+Requests are solved in a forked child, so the solutions' module state (like
+``verbose``) can't leak between requests.
+
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+from pathlib import Path
+
+from aoc.days import ROOT, Day, discover
+from aoc.runner import run_part
+
+DEFAULT_SOCKET = ROOT / ".cache" / "solver.sock"
+
+
+def handle_request(request: dict) -> dict:
+    try:
+        day = Day(int(request["year"]), int(request["day"]))
+        part = int(request.get("part", 1))
+    except (KeyError, TypeError, ValueError) as exc:
+        return {"answer": None, "seconds": 0.0, "cached": False, "error": repr(exc)}
+    if not day.path.exists():
+        return {"answer": None, "seconds": 0.0, "cached": False, "error": "no solution"}
+    input_file = Path(request["input"]) if request.get("input") else None
+    result = run_part(
+        day, part, input_file=input_file, use_cache=request.get("cache", True)
+    )
+    return {
+        "answer": result.answer,
+        "seconds": result.seconds,
+        "cached": result.cached,
+        "error": result.error,
+    }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response = {"error": f"invalid request: {exc}"}
+            else:
+                response = handle_request(request)
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    pass
+
+
+class ForkingSolverServer(socketserver.ForkingMixIn, SolverServer):
+    pass
+
+
+def preload() -> int:
+    """Import every solution, returning how many loaded."""
+    loaded = 0
+    for day in discover():
+        try:
+            day.load()
+        except Exception as exc:
+            print(f"Couldn't load {day}: {exc!r}")
+            continue
+        loaded += 1
+    return loaded
+
+
+def serve(socket_path: Path = DEFAULT_SOCKET):
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    print(f"Loaded {preload()} solutions")
+    with ForkingSolverServer(str(socket_path), RequestHandler) as server:
+        print(f"Listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def test_daemon(tmp_path):
+    import threading
+
+    from aoc.client import request
+
+    socket_path = tmp_path / "solver.sock"
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    server = SolverServer(str(socket_path), RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        response = request(
+            {
+                "year": 2022,
+                "day": 6,
+                "part": 2,
+                "input": str(input_file),
+                "cache": False,
+            },
+            socket_path,
+        )
+        assert response["answer"] == 19
+        assert response["error"] is None
+        response = request({"year": 2022, "day": 99}, socket_path)
+        assert response["error"] == "no solution"
+    finally:
+        server.shutdown()
+        server.server_close()
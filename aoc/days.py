@@ -0,0 +1,204 @@
+"""Discover and call the daily solution modules.
+
+The solutions were written over a couple of years and don't share one calling
+convention:
+
+* newer days take the puzzle text (``part1(puzzle_input: str)``) and return
+  the answer
+* older days take a filename (``part1(filename)``) and print the answer
+  (or return it, like the newer ones)
+
+Keyword-only options with defaults (like ``jobs=None``) are left at their
+defaults. Anything else (like the first few days of 2021) is reported as
+unsupported.
+
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import inspect
+import io
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TEXT_PARAMETERS = {"puzzle_input", "input_data"}
+FILE_PARAMETERS = {"filename"}
+
+
+class UnsupportedDay(Exception):
+    pass
+
+
+@dataclass(frozen=True, order=True)
+class Day:
+    year: int
+    day: int
+
+    @property
+    def directory(self) -> Path:
+        return ROOT / str(self.year)
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"day{self.day:02d}.py"
+
+    @property
+    def input_file(self) -> Path:
+        # the download script doesn't add the leading 0
+        return self.directory / f"day{self.day}-input.txt"
+
+    def load(self) -> ModuleType:
+        """Import the day's module (cached per process)."""
+        name = f"aoc_{self.year}_day{self.day:02d}"
+        if name in sys.modules:
+            return sys.modules[name]
+        # the 2022 solutions import `utils` from their own directory
+        if str(self.directory) not in sys.path:
+            sys.path.insert(0, str(self.directory))
+        spec = importlib.util.spec_from_file_location(name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
+
+    def __str__(self):
+        return f"{self.year} day {self.day:02d}"
+
+
+def discover(
+    years: list[int] | None = None, days: list[int] | None = None
+) -> Iterator[Day]:
+    """Yield the solution modules in the repository, in order."""
+    for directory in sorted(ROOT.iterdir()):
+        if not directory.is_dir() or not directory.name.isdigit():
+            continue
+        year = int(directory.name)
+        if years and year not in years:
+            continue
+        for path in sorted(directory.glob("day[0-9][0-9].py")):
+            day = int(path.stem.removeprefix("day"))
+            if days and day not in days:
+                continue
+            yield Day(year, day)
+
+
+def solver_style(func) -> str:
+    """Return "text" or "file" depending on what the part function expects."""
+    parameters = [
+        name
+        for name, parameter in inspect.signature(func).parameters.items()
+        if not (
+            parameter.kind is parameter.KEYWORD_ONLY
+            and parameter.default is not parameter.empty
+        )
+    ]
+    if len(parameters) == 1:
+        if parameters[0] in TEXT_PARAMETERS:
+            return "text"
+        if parameters[0] in FILE_PARAMETERS:
+            return "file"
+    raise UnsupportedDay(f"Unsupported signature: {func.__name__}{tuple(parameters)}")
+
+
+def get_part(module: ModuleType, part: int):
+    try:
+        func = getattr(module, f"part{part}")
+    except AttributeError:
+        raise UnsupportedDay(f"No part{part}() in {module.__file__}") from None
+    solver_style(func)
+    return func
+
+
+def solve(
+    module: ModuleType, part: int, input_file: Path, puzzle_input: str | None = None
+):
+    """Run one part of a solution and return its answer.
+
+    Output printed by the solution is suppressed; for the older solutions that
+    only print their answer (rather than returning it), the last line printed
+    is used as the answer.
+
+    """
+    func = get_part(module, part)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        if solver_style(func) == "text":
+            if puzzle_input is None:
+                puzzle_input = input_file.read_text()
+            return func(puzzle_input)
+        answer = func(input_file)
+    if answer is not None:
+        return answer
+
+    lines = [line for line in output.getvalue().splitlines() if line.strip()]
+    return lines[-1] if lines else None
+
+
+def test_discover():
+    found = list(discover([2022], [12]))
+    assert found == [Day(2022, 12)]
+    assert found[0].path.exists()
+
+
+def test_supported_days():
+    # only the first few days of 2021 predate a common signature
+    unsupported = {Day(2021, day) for day in range(1, 6)}
+    for day in discover():
+        if day in unsupported:
+            continue
+        module = day.load()
+        for part in (1, 2):
+            get_part(module, part)
+
+
+def test_solver_style_options():
+    import pytest
+
+    def part1(filename, *, jobs=None):
+        pass
+
+    def part2(filename, *, jobs):
+        pass
+
+    assert solver_style(part1) == "file"
+    with pytest.raises(UnsupportedDay):
+        solver_style(part2)
+
+
+def test_solve(tmp_path):
+    day = Day(2022, 12)
+    module = day.load()
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(module.SAMPLE)
+    assert solve(module, 1, input_file) == 31
+    assert solve(module, 2, input_file) == 29
+
+
+def test_solve_file_style(tmp_path):
+    module = Day(2022, 1).load()
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1000\n2000\n\n4000\n\n5000\n6000\n")
+    assert solve(module, 1, input_file) == "Most calories: 11000"
+
+
+def test_solve_keyword_options(tmp_path):
+    # 2021 day 15's part 2 takes --tiles and --algorithm as keyword options
+    module = Day(2021, 15).load()
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(
+        "1163751742\n1381373672\n2136511328\n3694931569\n7463417111\n"
+        "1319128137\n1359912421\n3125421639\n1293138521\n2311944581\n"
+    )
+    assert solve(module, 1, input_file) == "Best score: 40"
+    assert solve(module, 2, input_file) == "Best score: 315"
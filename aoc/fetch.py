@@ -0,0 +1,194 @@
+"""Download puzzle inputs, keeping a local cache so each is only fetched once.
+
+Inputs are stored by the SHA-256 of their content, and an index maps
+year/day/(hash of the session token) to the content, since every account gets
+different inputs. Downloads share a small pool of keep-alive connections.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from aoc.days import ROOT
+
+BASE_URL = "https://adventofcode.com"
+DEFAULT_CACHE = ROOT / ".cache" / "inputs"
+USER_AGENT = "github.com/smsearcy/advent-of-code"
+
+
+class FetchError(Exception):
+    pass
+
+
+@dataclass
+class Fetcher:
+    token: str
+    base_url: str = BASE_URL
+    cache_dir: Path = DEFAULT_CACHE
+    offline: bool = False
+    _local: threading.local = field(default_factory=threading.local, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _index: dict[str, str] | None = field(default=None, repr=False)
+
+    @property
+    def token_hash(self) -> str:
+        return hashlib.sha256(self.token.encode()).hexdigest()[:16]
+
+    @property
+    def index_file(self) -> Path:
+        return self.cache_dir / "index.json"
+
+    @property
+    def index(self) -> dict[str, str]:
+        if self._index is None:
+            if self.index_file.exists():
+                self._index = json.loads(self.index_file.read_text())
+            else:
+                self._index = {}
+        return self._index
+
+    def object_path(self, digest: str) -> Path:
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def cached(self, year: int, day: int) -> bytes | None:
+        digest = self.index.get(f"{year}/{day}/{self.token_hash}")
+        if digest is None:
+            return None
+        path = self.object_path(digest)
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
+    def store(self, year: int, day: int, content: bytes):
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+        with self._lock:
+            self.index[f"{year}/{day}/{self.token_hash}"] = digest
+
+    def save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.index_file.write_text(json.dumps(self.index, indent=2, sort_keys=True))
+
+    def fetch(self, year: int, day: int) -> bytes:
+        """Return an input from the cache, downloading it if needed."""
+        content = self.cached(year, day)
+        if content is not None:
+            return content
+        if self.offline:
+            raise FetchError(f"{year} day {day} is not cached (offline)")
+        content = self._download(year, day)
+        self.store(year, day, content)
+        return content
+
+    def fetch_many(
+        self, days: list[tuple[int, int]], *, jobs: int = 4
+    ) -> dict[tuple[int, int], bytes | Exception]:
+        """Fetch several inputs at once, returning the content or the error."""
+
+        def fetch_one(year_day: tuple[int, int]) -> bytes | Exception:
+            try:
+                return self.fetch(*year_day)
+            except (FetchError, OSError, http.client.HTTPException) as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = dict(zip(days, executor.map(fetch_one, days)))
+        self.save_index()
+        return results
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Each thread keeps its connection open between requests."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            url = urlsplit(self.base_url)
+            if url.scheme == "https":
+                connection = http.client.HTTPSConnection(url.netloc, timeout=30)
+            else:
+                connection = http.client.HTTPConnection(url.netloc, timeout=30)
+            self._local.connection = connection
+        return connection
+
+    def _download(self, year: int, day: int) -> bytes:
+        path = f"{urlsplit(self.base_url).path.rstrip('/')}/{year}/day/{day}/input"
+        headers = {"Cookie": self.token, "User-Agent": USER_AGENT}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                content = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                # the server closed the kept-alive connection, reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise FetchError(f"{year} day {day}: HTTP {response.status}")
+        return content
+
+
+def read_token(path: Path) -> str:
+    return path.read_text().strip()
+
+
+def test_fetch_many(tmp_path):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append((self.path, self.headers["Cookie"]))
+            if self.path.startswith("/2022/day/99/"):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = f"input for {self.path}\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        fetcher = Fetcher("session=abc", base_url, tmp_path)
+        days = [(2022, day) for day in (1, 2, 3, 99)]
+        results = fetcher.fetch_many(days, jobs=2)
+        assert results[2022, 2] == b"input for /2022/day/2/input\n"
+        assert isinstance(results[2022, 99], FetchError)
+        assert len(requests) == 4
+        assert requests[0][1] == "session=abc"
+
+        # everything is served from the cache now, even in a new process
+        fetcher = Fetcher("session=abc", base_url, tmp_path, offline=True)
+        assert fetcher.fetch(2022, 3) == b"input for /2022/day/3/input\n"
+        assert len(requests) == 4
+
+        # but other accounts have their own inputs
+        fetcher = Fetcher("session=xyz", base_url, tmp_path, offline=True)
+        assert isinstance(fetcher.fetch_many([(2022, 3)])[2022, 3], FetchError)
+    finally:
+        server.shutdown()
@@ -0,0 +1,674 @@
+"""Generate valid puzzle inputs at any size, for stress testing the solutions.
+
+Each generator takes a seeded `Random` and a `scale` (what the scale means is
+in the generator's docstring) and yields the lines of the input, so even
+very large inputs can be written out without holding them in memory.
+
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import string
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from random import Random
+
+Generator = Callable[[Random, int], Iterator[str]]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int):
+    def register(func: Generator) -> Generator:
+        GENERATORS[year, day] = func
+        return func
+
+    return register
+
+
+def generate(year: int, day: int, scale: int, *, seed: int = 0) -> Iterator[str]:
+    try:
+        func = GENERATORS[year, day]
+    except KeyError:
+        raise ValueError(f"No generator for {year} day {day}") from None
+    return func(Random(f"{year}-{day}-{scale}-{seed}"), scale)
+
+
+def write_input(path: Path, year: int, day: int, scale: int, *, seed: int = 0):
+    with open(path, "w") as f:
+        for line in generate(year, day, scale, seed=seed):
+            f.write(line)
+            f.write("\n")
+
+
+def _digit_grid(rng: Random, width: int, height: int, digits: str) -> Iterator[str]:
+    for _ in range(height):
+        yield "".join(rng.choices(digits, k=width))
+
+
+# 2021
+
+
+@generator(2021, 1)
+def sonar_depths(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` depth readings."""
+    depth = rng.randint(100, 200)
+    for _ in range(scale):
+        depth = max(0, depth + rng.randint(-5, 15))
+        yield str(depth)
+
+
+@generator(2021, 2)
+def submarine_commands(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` commands."""
+    for _ in range(scale):
+        yield f"{rng.choice(('forward', 'down', 'up'))} {rng.randint(1, 9)}"
+
+
+@generator(2021, 3)
+def diagnostic_codes(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` unique binary codes."""
+    bits = max(12, scale.bit_length() + 1)
+    for code in rng.sample(range(2**bits), scale):
+        yield f"{code:0{bits}b}"
+
+
+@generator(2021, 4)
+def bingo(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` bingo boards."""
+    pool = max(100, scale * 5)
+    numbers = list(range(pool))
+    rng.shuffle(numbers)
+    yield ",".join(str(number) for number in numbers)
+    for _ in range(scale):
+        yield ""
+        values = rng.sample(range(pool), 25)
+        for row in range(5):
+            yield " ".join(f"{value:2d}" for value in values[row * 5 : row * 5 + 5])
+
+
+@generator(2021, 5)
+def vent_lines(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` horizontal, vertical and diagonal lines."""
+    size = max(10, int(math.sqrt(scale) * 40))
+    for _ in range(scale):
+        x1, y1 = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice(((1, 0), (0, 1), (1, 1), (1, -1)))
+        longest = size - 1 - x1 if dx else size
+        if dy > 0:
+            longest = min(longest, size - 1 - y1)
+        elif dy < 0:
+            longest = min(longest, y1)
+        length = rng.randint(0, min(longest, size // 4))
+        x2, y2 = x1 + dx * length, y1 + dy * length
+        yield f"{x1},{y1} -> {x2},{y2}"
+
+
+@generator(2021, 6)
+def lanternfish(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` fish."""
+    yield ",".join(str(rng.randint(1, 5)) for _ in range(scale))
+
+
+@generator(2021, 7)
+def crab_positions(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` crabs."""
+    yield ",".join(str(rng.randrange(max(2, scale))) for _ in range(scale))
+
+
+SEGMENTS = {
+    0: "abcefg",
+    1: "cf",
+    2: "acdeg",
+    3: "acdfg",
+    4: "bcdf",
+    5: "abdfg",
+    6: "abdefg",
+    7: "acf",
+    8: "abcdefg",
+    9: "abcdfg",
+}
+
+
+@generator(2021, 8)
+def seven_segment(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` scrambled displays."""
+    for _ in range(scale):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit: int) -> str:
+            return "".join(
+                rng.sample([wiring[s] for s in SEGMENTS[digit]], len(SEGMENTS[digit]))
+            )
+
+        patterns = [scramble(digit) for digit in rng.sample(range(10), 10)]
+        outputs = [scramble(rng.randrange(10)) for _ in range(4)]
+        yield f"{' '.join(patterns)} | {' '.join(outputs)}"
+
+
+@generator(2021, 9)
+def heightmap(rng: Random, scale: int) -> Iterator[str]:
+    """A `scale` x `scale` height map."""
+    yield from _digit_grid(rng, scale, scale, string.digits)
+
+
+@generator(2021, 10)
+def navigation_chunks(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` lines, each either corrupted or incomplete."""
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    for _ in range(scale):
+        line = []
+        stack = []
+        for _ in range(rng.randint(20, 110)):
+            if stack and rng.random() < 0.45:
+                line.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                line.append(stack[-1])
+        if not stack:
+            stack.append(rng.choice("([{<"))
+            line.append(stack[-1])
+        if rng.random() < 0.5:
+            # corrupt it
+            wrong = [close for close in pairs.values() if close != pairs[stack[-1]]]
+            line.append(rng.choice(wrong))
+        yield "".join(line)
+
+
+@generator(2021, 11)
+def octopuses(rng: Random, scale: int) -> Iterator[str]:
+    """A `scale` x `scale` grid of energy levels, which all flash together at some step.
+
+    Random grids larger than the puzzle's rarely synchronize, so each grid is
+    simulated for up to `OCTOPUS_STEPS`, and if it doesn't synchronize the
+    next is drawn from higher levels (which synchronize sooner). Levels of 8
+    and 9 synchronize on the first step, so that always ends.
+
+    """
+    size = max(1, scale)
+    for lowest in range(9):
+        levels = rng.choices(string.digits[lowest:], k=size * size)
+        if lowest == 8:
+            levels[0] = "9"
+        if lowest == 8 or _octopus_sync_step(levels, size, OCTOPUS_STEPS):
+            break
+    for y in range(size):
+        yield "".join(levels[y * size : (y + 1) * size])
+
+
+OCTOPUS_STEPS = 1000
+
+
+def _octopus_sync_step(levels: list[str], size: int, limit: int) -> int | None:
+    """The first step when every octopus flashes, if it's within `limit`."""
+    neighbors = [
+        [
+            y * size + x
+            for y in range(max(0, row - 1), min(size, row + 2))
+            for x in range(max(0, column - 1), min(size, column + 2))
+            if (x, y) != (column, row)
+        ]
+        for row in range(size)
+        for column in range(size)
+    ]
+    energy = [int(level) for level in levels]
+    for step in range(1, limit + 1):
+        energy = [level + 1 for level in energy]
+        pending = [index for index, level in enumerate(energy) if level > 9]
+        flashed = 0
+        while pending:
+            flashed += 1
+            for neighbor in neighbors[pending.pop()]:
+                energy[neighbor] += 1
+                if energy[neighbor] == 10:
+                    pending.append(neighbor)
+        if flashed == len(energy):
+            return step
+        energy = [0 if level > 9 else level for level in energy]
+    return None
+
+
+@generator(2021, 12)
+def cave_system(rng: Random, scale: int) -> Iterator[str]:
+    """About `scale` caves, no more than `MAX_SMALL_CAVES` of them small.
+
+    Counting the paths is exponential in the number of small caves (like the
+    puzzle's 10-15), so larger systems get more big caves and passages
+    instead. Big caves are never connected to each other.
+
+    """
+    caves = max(2, scale)
+    small_count = min(MAX_SMALL_CAVES, max(1, round(caves * 0.75)))
+    # enough letters for every cave to have a different name
+    letters = 2
+    while 26**letters < caves * 2:
+        letters += 1
+    names = set()
+    small = []
+    big = []
+    while len(small) + len(big) < caves:
+        name = "".join(rng.choices(string.ascii_lowercase, k=letters))
+        if name in names or name in ("start", "end"):
+            continue
+        names.add(name)
+        if len(small) < small_count:
+            small.append(name)
+        else:
+            big.append(name.upper())
+
+    edges = set()
+    for cave in big:
+        for other in rng.sample(small, min(len(small), 3)):
+            edges.add((cave, other))
+    for cave in small:
+        others = [other for other in small + big if other != cave]
+        if others:
+            edges.add((cave, rng.choice(others)))
+    caves = small + big
+    for cave in rng.sample(caves, min(len(caves), 3)):
+        edges.add(("start", cave))
+    for cave in rng.sample(caves, min(len(caves), 3)):
+        edges.add((cave, "end"))
+    for a, b in sorted(edges):
+        yield f"{a}-{b}"
+
+
+MAX_SMALL_CAVES = 12
+
+
+@generator(2021, 13)
+def origami(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` dots, with the paper sized so it stays sparse."""
+    x_folds = [40]
+    y_folds = [6]
+    while (x_folds[0] * 2 + 1) * (y_folds[0] * 2 + 1) < scale * 4:
+        x_folds.insert(0, x_folds[0] * 2 + 1)
+        y_folds.insert(0, y_folds[0] * 2 + 1)
+
+    def valid(value: int, folds: list[int]) -> bool:
+        # a dot can't land on a fold line
+        for fold in folds:
+            if value == fold:
+                return False
+            if value > fold:
+                value = 2 * fold - value
+        return True
+
+    width = x_folds[0] * 2 + 1
+    height = y_folds[0] * 2 + 1
+    xs = [x for x in range(width) if valid(x, x_folds)]
+    ys = [y for y in range(height) if valid(y, y_folds)]
+    dots = set()
+    while len(dots) < scale:
+        dots.add((rng.choice(xs), rng.choice(ys)))
+    for x, y in dots:
+        yield f"{x},{y}"
+    yield ""
+    for x_fold, y_fold in zip(x_folds, y_folds):
+        yield f"fold along x={x_fold}"
+        yield f"fold along y={y_fold}"
+
+
+@generator(2021, 14)
+def polymer(rng: Random, scale: int) -> Iterator[str]:
+    """A template `scale` elements long."""
+    elements = rng.sample(string.ascii_uppercase, 10)
+    yield "".join(rng.choices(elements, k=max(2, scale)))
+    yield ""
+    for first in elements:
+        for second in elements:
+            yield f"{first}{second} -> {rng.choice(elements)}"
+
+
+@generator(2021, 15)
+def risk_map(rng: Random, scale: int) -> Iterator[str]:
+    """A `scale` x `scale` risk map."""
+    yield from _digit_grid(rng, scale, scale, "123456789")
+
+
+def _bits_packet(rng: Random, depth: int) -> str:
+    version = f"{rng.randrange(8):03b}"
+    if depth <= 0 or rng.random() < 0.3:
+        value = f"{rng.randrange(2**16):b}"
+        value = value.zfill(math.ceil(len(value) / 4) * 4)
+        groups = [value[i : i + 4] for i in range(0, len(value), 4)]
+        body = "".join(
+            ("0" if idx == len(groups) - 1 else "1") + group
+            for idx, group in enumerate(groups)
+        )
+        return f"{version}100{body}"
+
+    type_ = rng.choice([t for t in range(8) if t != 4])
+    # the comparison operators (5, 6, 7) always have two sub-packets
+    count = 2 if type_ >= 5 else rng.randint(1, 3)
+    sub_packets = [_bits_packet(rng, depth - 1) for _ in range(count)]
+    contents = "".join(sub_packets)
+    if rng.random() < 0.5:
+        return f"{version}{type_:03b}0{len(contents):015b}{contents}"
+    return f"{version}{type_:03b}1{len(sub_packets):011b}{contents}"
+
+
+@generator(2021, 16)
+def bits_transmissions(rng: Random, scale: int) -> Iterator[str]:
+    """One transmission with packets nested about `log2(scale)` deep."""
+    message = _bits_packet(rng, max(1, scale.bit_length()))
+    message += "0" * (-len(message) % 4)
+    yield f"{int('1' + message, 2):X}"[1:]
+
+
+# 2022
+
+
+@generator(2022, 1)
+def elf_calories(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` elves."""
+    for idx in range(scale):
+        if idx:
+            yield ""
+        for _ in range(rng.randint(1, 15)):
+            yield str(rng.randint(1000, 60000))
+
+
+@generator(2022, 2)
+def strategy_guide(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` rounds."""
+    for _ in range(scale):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+
+
+@generator(2022, 3)
+def rucksacks(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` groups of three rucksacks."""
+    letters = string.ascii_letters
+    for _ in range(scale):
+        badge = rng.choice(letters)
+        # every other item is left out of at least one rucksack in the group
+        excluded = [set(), set(), set()]
+        for letter in letters:
+            if letter != badge:
+                excluded[rng.randrange(3)].add(letter)
+        for idx in range(3):
+            allowed = [letter for letter in letters if letter not in excluded[idx]]
+            allowed.remove(badge)
+            shared = rng.choice(allowed)
+            allowed.remove(shared)
+            rng.shuffle(allowed)
+            left_items = allowed[: len(allowed) // 2]
+            right_items = allowed[len(allowed) // 2 :]
+            size = rng.randint(8, 24)
+            left = [badge, shared] + rng.choices(left_items, k=size - 2)
+            right = [shared] + rng.choices(right_items, k=size - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            yield "".join(left + right)
+
+
+@generator(2022, 4)
+def section_assignments(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` pairs of ranges."""
+    for _ in range(scale):
+        ranges = []
+        for _ in range(2):
+            begin = rng.randint(1, 98)
+            ranges.append(f"{begin}-{rng.randint(begin, 99)}")
+        yield ",".join(ranges)
+
+
+@generator(2022, 5)
+def crate_stacks(rng: Random, scale: int) -> Iterator[str]:
+    """Nine stacks of crates and `scale` moves."""
+    stacks = [
+        rng.choices(string.ascii_uppercase, k=rng.randint(1, 8)) for _ in range(9)
+    ]
+    for level in range(max(len(stack) for stack in stacks) - 1, -1, -1):
+        yield " ".join(
+            f"[{stack[level]}]" if level < len(stack) else "   " for stack in stacks
+        ).rstrip()
+    yield " " + "   ".join(str(label) for label in range(1, 10))
+    yield ""
+    sizes = [len(stack) for stack in stacks]
+    for _ in range(scale):
+        source = rng.choice([idx for idx, size in enumerate(sizes) if size])
+        destination = rng.choice([idx for idx in range(9) if idx != source])
+        quantity = rng.randint(1, sizes[source])
+        sizes[source] -= quantity
+        sizes[destination] += quantity
+        yield f"move {quantity} from {source + 1} to {destination + 1}"
+    # leave a crate on top of every stack
+    for destination in range(9):
+        if sizes[destination]:
+            continue
+        source = sizes.index(max(sizes))
+        sizes[source] -= 1
+        sizes[destination] += 1
+        yield f"move 1 from {source + 1} to {destination + 1}"
+
+
+@generator(2022, 6)
+def datastream(rng: Random, scale: int) -> Iterator[str]:
+    """A `scale` character buffer, with the first marker at the end."""
+    noise = "".join(rng.choices("abcd", k=max(0, scale - 14)))
+    yield noise + "".join(rng.sample(string.ascii_lowercase, 14))
+
+
+@generator(2022, 7)
+def terminal_output(rng: Random, scale: int) -> Iterator[str]:
+    """About `scale` lines of terminal output."""
+    yield "$ cd /"
+    lines = 1
+    depth = 0
+    while lines < scale:
+        yield "$ ls"
+        directories = [f"d{idx}" for idx in range(rng.randint(0, 3))]
+        for name in directories:
+            yield f"dir {name}"
+        files = rng.randint(1, 6)
+        for idx in range(files):
+            yield f"{rng.randint(1000, 300000)} f{idx}.txt"
+        lines += 1 + len(directories) + files
+        if directories and lines < scale:
+            yield f"$ cd {rng.choice(directories)}"
+            depth += 1
+        else:
+            up = rng.randint(0, depth)
+            for _ in range(up):
+                yield "$ cd .."
+            depth -= up
+            # only list the same directory once
+            name = f"n{lines}"
+            yield "$ ls"
+            yield f"dir {name}"
+            yield f"$ cd {name}"
+            depth += 1
+            lines += 3 + up
+
+
+@generator(2022, 8)
+def tree_heights(rng: Random, scale: int) -> Iterator[str]:
+    """A `scale` x `scale` forest."""
+    yield from _digit_grid(rng, scale, scale, string.digits)
+
+
+@generator(2022, 9)
+def rope_moves(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` moves."""
+    for _ in range(scale):
+        yield f"{rng.choice('RULD')} {rng.randint(1, 20)}"
+
+
+@generator(2022, 10)
+def cpu_instructions(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` instructions (at least enough to draw the screen)."""
+    register = 1
+    for _ in range(max(scale, 240)):
+        if rng.random() < 0.4:
+            yield "noop"
+            continue
+        value = rng.randint(-10, 10) or 1
+        if not 0 <= register + value < 40:
+            value = -value
+        register += value
+        yield f"addx {value}"
+
+
+@generator(2022, 11)
+def monkeys(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` monkeys."""
+    count = max(2, scale)
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % prime for prime in primes):
+            primes.append(candidate)
+        candidate += 1
+    rng.shuffle(primes)
+    for number in range(count):
+        if number:
+            yield ""
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        operation = rng.choice(
+            ["old * old", f"old * {rng.randint(2, 19)}", f"old + {rng.randint(1, 8)}"]
+        )
+        others = [other for other in range(count) if other != number]
+        yield f"Monkey {number}:"
+        yield f"  Starting items: {items}"
+        yield f"  Operation: new = {operation}"
+        yield f"  Test: divisible by {primes[number]}"
+        yield f"    If true: throw to monkey {rng.choice(others)}"
+        yield f"    If false: throw to monkey {rng.choice(others)}"
+
+
+@generator(2022, 12)
+def hill_terrain(rng: Random, scale: int) -> Iterator[str]:
+    """A terrain `scale` wide and a third as tall.
+
+    The elevation never changes by more than one between neighbors, so every
+    square can reach the summit.
+
+    """
+    width = max(40, scale)
+    height = max(12, scale // 3)
+    summit = rng.randrange(width), rng.randrange(height)
+    # start in the corner furthest from the summit, so it's far enough to be at "a"
+    start = max(
+        ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)),
+        key=lambda corner: abs(corner[0] - summit[0]) + abs(corner[1] - summit[1]),
+    )
+
+    # spread each hill down its sides one level per step, highest levels first
+    levels = [0] * (width * height)
+    pending = [[] for _ in range(26)]
+    hills = [(summit, 25)]
+    for _ in range(max(1, width * height // 100)):
+        hills.append(
+            ((rng.randrange(width), rng.randrange(height)), rng.randint(3, 20))
+        )
+    for (x, y), level in hills:
+        levels[y * width + x] = max(levels[y * width + x], level)
+        pending[level].append((x, y))
+    for level in range(25, 0, -1):
+        for x, y in pending[level]:
+            if levels[y * width + x] != level:
+                continue
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    if levels[ny * width + nx] < level - 1:
+                        levels[ny * width + nx] = level - 1
+                        pending[level - 1].append((nx, ny))
+
+    rows = [
+        [
+            min(levels[y * width + x], abs(x - start[0]) + abs(y - start[1]))
+            for x in range(width)
+        ]
+        for y in range(height)
+    ]
+    for y, row in enumerate(rows):
+        line = []
+        for x, level in enumerate(row):
+            if (x, y) == summit:
+                line.append("E")
+            elif (x, y) == start:
+                line.append("S")
+            else:
+                line.append(string.ascii_lowercase[level])
+        yield "".join(line)
+
+
+def _packet(rng: Random, depth: int) -> list:
+    packet = []
+    for _ in range(rng.randint(0, 5)):
+        if depth > 0 and rng.random() < 0.4:
+            packet.append(_packet(rng, depth - 1))
+        else:
+            packet.append(rng.randint(0, 10))
+    return packet
+
+
+@generator(2022, 13)
+def distress_packets(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` pairs of packets, nested up to about `log2(scale) + 4` deep."""
+    depth = scale.bit_length() + 4
+    for idx in range(scale):
+        if idx:
+            yield ""
+        left = _packet(rng, depth)
+        right = _packet(rng, depth)
+        while right == left:
+            right = _packet(rng, depth)
+        yield json.dumps(left, separators=(",", ":"))
+        yield json.dumps(right, separators=(",", ":"))
+
+
+@generator(2022, 14)
+def rock_paths(rng: Random, scale: int) -> Iterator[str]:
+    """`scale` rock paths below the sand source."""
+    spread = max(10, scale * 2)
+    for _ in range(scale):
+        x = rng.randint(500 - spread, 500 + spread)
+        y = rng.randint(2, spread)
+        points = [f"{x},{y}"]
+        for idx in range(rng.randint(1, 4)):
+            if idx % 2:
+                y = max(1, y + rng.randint(-4, 4))
+            else:
+                x += rng.choice((-1, 1)) * rng.randint(1, 6)
+            points.append(f"{x},{y}")
+        yield " -> ".join(points)
+
+
+def test_generate_is_reproducible():
+    first = list(generate(2022, 8, 20, seed=1))
+    assert first == list(generate(2022, 8, 20, seed=1))
+    assert first != list(generate(2022, 8, 20, seed=2))
+    assert len(first) == 20 and all(len(line) == 20 for line in first)
+
+
+def test_puzzle_shapes():
+    # the caves stay countable and the octopuses synchronize
+    edges = [line.split("-") for line in generate(2021, 12, 60, seed=1)]
+    small = {cave for edge in edges for cave in edge if cave.islower()}
+    assert len(small - {"start", "end"}) <= MAX_SMALL_CAVES
+    for seed in range(3):
+        levels = "".join(generate(2021, 11, 20, seed=seed))
+        assert _octopus_sync_step(list(levels), 20, OCTOPUS_STEPS)
+
+
+def test_generated_inputs_solve(tmp_path):
+    from aoc.days import Day, solve
+
+    # day 16 was never finished and day 11's 10,000 rounds are too slow here
+    skip = {(2021, 16), (2022, 11)}
+    # these predate a common signature (see `aoc.days`)
+    skip.update((2021, day) for day in range(1, 6))
+    input_file = tmp_path / "input.txt"
+    for year, day in GENERATORS:
+        write_input(input_file, year, day, 4)
+        assert input_file.stat().st_size > 0
+        if (year, day) in skip:
+            continue
+        module = Day(year, day).load()
+        for part in (1, 2):
+            solve(module, part, input_file)
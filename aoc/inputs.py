@@ -0,0 +1,156 @@
+"""Read puzzle inputs lazily from a memory-mapped file.
+
+`MappedInput` maps the input file instead of reading it, and hands out one
+line (or record, or block) at a time, so the whole input never has to be held
+as a string. The `lines()` and `records()` helpers accept either a
+`MappedInput` or a plain string, so a `parse_input()` written with them works
+with both the real input and the `SAMPLE` strings in the tests.
+
+"""
+
+from __future__ import annotations
+
+import mmap
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+
+class MappedInput:
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if self.path.stat().st_size == 0:
+                # empty files can't be mapped
+                self._map = None
+                self._view = memoryview(b"")
+            else:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._map)
+
+    def close(self):
+        """Unmap the file (any views from `raw_lines()` must be released first)."""
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self) -> MappedInput:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._view)
+
+    def _line_bounds(self) -> Iterator[tuple[int, int]]:
+        size = len(self._view)
+        start = 0
+        while start < size:
+            end = self._map.find(b"\n", start)
+            if end == -1:
+                end = size
+            stop = end
+            if stop > start and self._view[stop - 1] == 13:  # "\r"
+                stop -= 1
+            yield start, stop
+            start = end + 1
+
+    def raw_lines(self) -> Iterator[memoryview]:
+        """Yield each line (without the line ending) as a view into the file."""
+        for start, stop in self._line_bounds():
+            yield self._view[start:stop]
+
+    def lines(self) -> Iterator[str]:
+        for start, stop in self._line_bounds():
+            yield str(self._view[start:stop], "utf-8")
+
+    def splitlines(self) -> Iterator[str]:
+        """Same as `lines()`, for code written for `str.splitlines()`."""
+        return self.lines()
+
+    def records(self) -> Iterator[list[str]]:
+        """Yield groups of lines separated by blank lines."""
+        return _group(self.lines())
+
+    def blocks(self, size: int) -> Iterator[memoryview]:
+        """Yield the file in fixed size chunks (the last may be short)."""
+        for start in range(0, len(self._view), size):
+            yield self._view[start : start + size]
+
+    def __str__(self):
+        return str(self._view, "utf-8")
+
+
+def _group(lines: Iterable[str]) -> Iterator[list[str]]:
+    record = []
+    for line in lines:
+        if line:
+            record.append(line)
+        elif record:
+            yield record
+            record = []
+    if record:
+        yield record
+
+
+def lines(puzzle_input: str | MappedInput) -> Iterator[str]:
+    if isinstance(puzzle_input, MappedInput):
+        return puzzle_input.lines()
+    return iter(puzzle_input.splitlines())
+
+
+def records(puzzle_input: str | MappedInput) -> Iterator[list[str]]:
+    if isinstance(puzzle_input, MappedInput):
+        return puzzle_input.records()
+    return _group(puzzle_input.splitlines())
+
+
+def test_mapped_input(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"1000\n2000\r\n\n\n4000\n\n5000\n6000")
+    with MappedInput(path) as puzzle_input:
+        assert list(puzzle_input.lines()) == [
+            "1000",
+            "2000",
+            "",
+            "",
+            "4000",
+            "",
+            "5000",
+            "6000",
+        ]
+        assert list(records(puzzle_input)) == [
+            ["1000", "2000"],
+            ["4000"],
+            ["5000", "6000"],
+        ]
+        assert [bytes(block) for block in puzzle_input.blocks(16)] == [
+            b"1000\n2000\r\n\n\n400",
+            b"0\n\n5000\n6000",
+        ]
+        for line in puzzle_input.raw_lines():
+            assert bytes(line) == b"1000"
+            line.release()
+            break
+
+
+def test_lines_from_string():
+    assert list(lines("a\nb\n")) == ["a", "b"]
+    assert list(records("a\nb\n\nc\n")) == [["a", "b"], ["c"]]
+
+
+def test_records_match(tmp_path):
+    path = tmp_path / "input.txt"
+    for text in ("a\n\n\nb", "a\r\nb\r\n\r\nc\r\n", "\n\na\n\n"):
+        path.write_bytes(text.encode())
+        with MappedInput(path) as puzzle_input:
+            assert list(records(text)) == list(records(puzzle_input))
+    assert list(records("a\n\n\nb")) == [["a"], ["b"]]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.touch()
+    with MappedInput(path) as puzzle_input:
+        assert list(puzzle_input.lines()) == []
+        assert str(puzzle_input) == ""
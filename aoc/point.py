@@ -0,0 +1,135 @@
+"""The x, y coordinate shared by the grid puzzles.
+
+`Point` is a named tuple, so it has no instance ``__dict__`` and hashing and
+comparing happen in C, which matters when millions of them are dict keys.
+For dense indexing there's also `Point.key`, which packs both coordinates
+into one int (for coordinates within +/- 2**31).
+
+Run ``python -m aoc.point`` for a micro-benchmark against the frozen
+dataclass the days used to define.
+
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import NamedTuple
+
+KEY_BITS = 32
+INTERN_SIZE = 256
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+    @classmethod
+    def load(cls, value: str) -> Point:
+        return cls(*(int(c) for c in value.split(",")))
+
+    @classmethod
+    def line(cls, begin: Point, end: Point) -> list[Point]:
+        """Create the list of points that make up a line.
+
+        Only cardinal directions are currently supported!
+
+        """
+        if begin == end:
+            return [begin]
+        if begin.y == end.y:
+            if begin.x < end.x:
+                delta = 1
+            else:
+                delta = -1
+            return [cls(x, begin.y) for x in range(begin.x, end.x + delta, delta)]
+        if begin.x == end.x:
+            if begin.y < end.y:
+                delta = 1
+            else:
+                delta = -1
+            return [cls(begin.x, y) for y in range(begin.y, end.y + delta, delta)]
+        raise ValueError("Line must be horizontal or vertical.")
+
+    @classmethod
+    def from_key(cls, key: int) -> Point:
+        y = (key + (1 << (KEY_BITS - 1))) >> KEY_BITS
+        return cls(key - (y << KEY_BITS), y)
+
+    @property
+    def key(self) -> int:
+        """Both coordinates packed into a single int."""
+        return self.x + (self.y << KEY_BITS)
+
+
+_interned: dict[int, Point] = {}
+
+
+def interned(x: int, y: int) -> Point:
+    """Return a shared `Point`, for coordinates from 0 to `INTERN_SIZE`.
+
+    For puzzles that keep many references to the same few points.
+
+    """
+    key = x + (y << KEY_BITS)
+    try:
+        return _interned[key]
+    except KeyError:
+        point = Point(x, y)
+        if 0 <= x < INTERN_SIZE and 0 <= y < INTERN_SIZE:
+            _interned[key] = point
+        return point
+
+
+@dataclass(frozen=True)
+class DataclassPoint:
+    """How the days used to define their points, for comparison."""
+
+    x: int
+    y: int
+
+
+def benchmark(size: int = 200, number: int = 5) -> list[tuple[str, float, float, int]]:
+    """Time creating and hashing `size` x `size` points, and measure them.
+
+    Returns (variant, create seconds, set seconds, bytes per point) rows.
+
+    """
+    rows = []
+    variants = (("dataclass", DataclassPoint), ("Point", Point), ("interned", interned))
+    for name, make in variants:
+        coordinates = [(x, y) for y in range(size) for x in range(size)]
+
+        def create():
+            return [make(x, y) for x, y in coordinates]
+
+        create_seconds = min(timeit.repeat(create, number=1, repeat=number))
+        tracemalloc.start()
+        points = create()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        set_seconds = min(timeit.repeat(lambda: set(points), number=1, repeat=number))
+        rows.append((name, create_seconds, set_seconds, memory // len(points)))
+    return rows
+
+
+def main():
+    print(f"{'Variant':<10}  {'Create':>8}  {'Hash':>8}  {'Bytes':>5}")
+    for name, create_seconds, set_seconds, size in benchmark():
+        print(f"{name:<10}  {create_seconds:8.4f}  {set_seconds:8.4f}  {size:5}")
+
+
+def test_point():
+    assert Point.load("498,4") == Point(498, 4)
+    assert Point.line(Point(2, 1), Point(0, 1)) == [(2, 1), (1, 1), (0, 1)]
+    assert not hasattr(Point(1, 2), "__dict__")
+    for point in (Point(3, 4), Point(-3, 4), Point(3, -4), Point(-(2**31), 2**31)):
+        assert Point.from_key(point.key) == point
+    assert interned(1, 2) is interned(1, 2) == Point(1, 2)
+    assert {Point(1, 2): 0}.get(interned(1, 2)) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
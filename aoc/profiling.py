@@ -0,0 +1,115 @@
+"""Profile a single call: cProfile stats, collapsed stacks or memory use."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+
+def profile_stats(func, *args, sort: str = "cumulative", limit: int = 25):
+    """Run `func` under cProfile and print the top functions."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    stats = pstats.Stats(profiler, stream=sys.stdout)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return result
+
+
+class StackProfiler:
+    """Record the time spent in each complete call stack.
+
+    The output is the "collapsed" format used by flamegraph.pl and speedscope:
+    one line per stack, ``outer;inner;innermost <microseconds>``.
+
+    """
+
+    def __init__(self):
+        self.totals: dict[tuple[str, ...], float] = defaultdict(float)
+        self._stack: list[str] = []
+        self._last = 0.0
+
+    def _charge(self):
+        now = time.perf_counter()
+        if self._stack:
+            self.totals[tuple(self._stack)] += now - self._last
+        self._last = now
+
+    def _callback(self, frame, event, arg):
+        if event == "call":
+            name = f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_name}"
+        elif event == "c_call":
+            name = getattr(arg, "__qualname__", repr(arg))
+        elif event in ("return", "c_return", "c_exception"):
+            name = None
+        else:
+            return
+        self._charge()
+        if name is not None:
+            self._stack.append(name)
+        elif self._stack:
+            self._stack.pop()
+
+    def runcall(self, func, *args):
+        self._last = time.perf_counter()
+        sys.setprofile(self._callback)
+        try:
+            return func(*args)
+        finally:
+            sys.setprofile(None)
+            self._charge()
+            self._stack.clear()
+
+    def collapsed(self) -> str:
+        lines = []
+        for stack, seconds in sorted(self.totals.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds:
+                lines.append(f"{';'.join(stack)} {microseconds}")
+        return "\n".join(lines) + "\n"
+
+
+def profile_collapsed(func, *args, output: Path):
+    """Run `func` and write its collapsed call stacks to `output`."""
+    profiler = StackProfiler()
+    result = profiler.runcall(func, *args)
+    output.write_text(profiler.collapsed())
+    print(f"Collapsed stacks written to {output}")
+    return result
+
+
+def trace_memory(func, *args, limit: int = 10):
+    """Run `func` under tracemalloc and print the top allocating lines."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        snapshot = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f"Peak traced memory: {peak / 1024:,.1f} KiB")
+    for statistic in snapshot.statistics("lineno")[:limit]:
+        print(f"  {statistic}")
+    return result
+
+
+def test_stack_profiler():
+    def inner():
+        return sum(range(1000))
+
+    def outer():
+        return inner() + inner()
+
+    profiler = StackProfiler()
+    assert profiler.runcall(outer) == 2 * sum(range(1000))
+    stacks = {";".join(stack) for stack in profiler.totals}
+    assert "profiling:outer;profiling:inner;sum" in stacks
+
+
+def test_trace_memory(capsys):
+    assert trace_memory(lambda: len([0] * 100_000)) == 100_000
+    assert "Peak traced memory" in capsys.readouterr().out
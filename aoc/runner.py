@@ -0,0 +1,257 @@
+"""Run many days' solutions at once across a pool of processes."""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+from aoc.cache import MISSING, AnswerCache, input_digest, source_digest
+from aoc.days import Day, UnsupportedDay, solve
+
+
+@dataclass
+class PartResult:
+    day: Day
+    part: int
+    answer: object = None
+    seconds: float = 0.0
+    error: str | None = None
+    cached: bool = False
+    input_file: Path | None = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return self.error
+        return str(self.answer)
+
+
+def run_part(
+    day: Day,
+    part: int,
+    *,
+    input_file: Path | None = None,
+    use_cache: bool = True,
+    settings: dict[str, bool] | None = None,
+) -> PartResult:
+    """Solve a single part (this is what runs in the worker processes).
+
+    The day's own input is used unless `input_file` is given. `settings` are
+    module globals to set first (like the day's own switches).
+
+    """
+    if input_file is None:
+        input_file = day.input_file
+    result = PartResult(day, part, input_file=input_file)
+    if not input_file.exists():
+        result.error = "missing input"
+        return result
+    try:
+        module = day.load()
+        for name, value in (settings or {}).items():
+            setattr(module, name, value)
+        if use_cache:
+            answers = AnswerCache()
+            key = (source_digest(module), part, input_digest(input_file))
+            answer = answers.get(*key)
+            if answer is not MISSING:
+                result.answer = answer
+                result.cached = True
+                return result
+        start = time.perf_counter()
+        result.answer = solve(module, part, input_file)
+        result.seconds = time.perf_counter() - start
+    except UnsupportedDay:
+        result.error = "unsupported"
+        return result
+    except Exception as exc:
+        result.error = f"error: {exc!r}"
+        return result
+    if use_cache:
+        try:
+            answers.put(*key, result.answer)
+        except OSError:
+            # the answer stands even if it couldn't be saved
+            pass
+    return result
+
+
+def run_days(
+    days: list[Day], *, jobs: int | None = None, use_cache: bool = True
+) -> list[PartResult]:
+    """Run part 1 and part 2 of every day, returning the results in day order."""
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(run_part, day, part, use_cache=use_cache)
+            for day in days
+            for part in (1, 2)
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def solve_input(
+    day: Day, input_file: Path, use_cache: bool, settings: dict[str, bool] | None
+) -> list[PartResult]:
+    return [
+        run_part(
+            day, part, input_file=input_file, use_cache=use_cache, settings=settings
+        )
+        for part in (1, 2)
+    ]
+
+
+def run_inputs(
+    day: Day,
+    input_files: Iterable[Path],
+    *,
+    jobs: int | None = None,
+    use_cache: bool = True,
+    settings: dict[str, bool] | None = None,
+) -> Iterator[PartResult]:
+    """Solve both parts of one day for many inputs, yielding results as they finish.
+
+    Each worker loads its own copy of the day, with `settings` applied to it
+    (see `run_part`).
+
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(solve_input, day, input_file, use_cache, settings)
+            for input_file in input_files
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+RESULT_FIELDS = ("input", "part", "answer", "seconds", "cached", "error")
+
+
+def write_results(results: Iterable[PartResult], output: TextIO, format: str) -> int:
+    """Write each result as a CSV row or JSON line as it arrives.
+
+    Returns the number of failed results.
+
+    """
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown results format: {format}")
+    if format == "csv":
+        writer = csv.writer(output)
+        writer.writerow(RESULT_FIELDS)
+    failures = 0
+    for result in results:
+        if result.error is not None:
+            failures += 1
+        row = (
+            str(result.input_file),
+            result.part,
+            result.answer,
+            round(result.seconds, 6),
+            result.cached,
+            result.error,
+        )
+        if format == "csv":
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(dict(zip(RESULT_FIELDS, row)), default=str))
+            output.write("\n")
+        output.flush()
+    return failures
+
+
+def format_table(results: list[PartResult]) -> str:
+    """Format the results with one row per day."""
+    rows = [("Day", "Part 1", "Time", "Part 2", "Time", "Total")]
+    by_day: dict[Day, dict[int, PartResult]] = {}
+    for result in results:
+        by_day.setdefault(result.day, {})[result.part] = result
+    for day, parts in by_day.items():
+        row = [str(day)]
+        total = 0.0
+        for part in (1, 2):
+            result = parts[part]
+            row.append(result.status)
+            if result.error is not None:
+                row.append("")
+            elif result.cached:
+                row.append("cached")
+            else:
+                row.append(f"{result.seconds:.3f}s")
+            total += result.seconds
+        row.append(f"{total:.3f}s")
+        rows.append(tuple(row))
+
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def test_run_days(tmp_path, monkeypatch):
+    day = Day(2022, 6)
+    monkeypatch.setattr(Day, "input_file", tmp_path / "input.txt")
+    (tmp_path / "input.txt").write_text("mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    results = run_days([day], jobs=1, use_cache=False)
+    assert [result.answer for result in results] == [7, 19]
+
+
+def test_run_part_cache_failure(tmp_path, monkeypatch):
+    def put(*_args):
+        raise FileNotFoundError("evicted")
+
+    monkeypatch.setattr(AnswerCache, "get", lambda *_args: MISSING)
+    monkeypatch.setattr(AnswerCache, "put", put)
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("mjqjpqmgbljsphdztnvjfqwrcgsmlb")
+    result = run_part(Day(2022, 6), 1, input_file=input_file)
+    assert (result.answer, result.error) == (7, None)
+
+
+def test_run_part_settings(tmp_path):
+    day = Day(2022, 12)
+    module = day.load()
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(module.SAMPLE)
+    try:
+        result = run_part(
+            day,
+            1,
+            input_file=input_file,
+            use_cache=False,
+            settings={"bidirectional": True},
+        )
+        assert module.bidirectional is True
+    finally:
+        module.bidirectional = False
+    assert (result.answer, result.error) == (31, None)
+
+
+def test_run_inputs(tmp_path):
+    import io
+
+    inputs = []
+    for index, buffer in enumerate(
+        ("mjqjpqmgbljsphdztnvjfqwrcgsmlb", "nppdvjthqldpwncqszvftbrmjlhg")
+    ):
+        inputs.append(tmp_path / f"input{index}.txt")
+        inputs[-1].write_text(buffer)
+    results = run_inputs(Day(2022, 6), inputs, jobs=2, use_cache=False)
+    output = io.StringIO()
+    assert write_results(results, output, "jsonl") == 0
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    answers = {(Path(row["input"]).name, row["part"]): row["answer"] for row in rows}
+    assert answers == {
+        ("input0.txt", 1): 7,
+        ("input0.txt", 2): 19,
+        ("input1.txt", 1): 6,
+        ("input1.txt", 2): 23,
+    }
@@ -0,0 +1,387 @@
+"""Shortest path searches over integer node ids (like `Grid` cell indexes).
+
+The graph is given as `neighbors`, which maps a node id to the ids it has
+edges to: a list of them, or `GridNeighbors` for a grid's cells, which works
+them out from the index instead of storing them. Edges can be filtered with
+a ``passable(node, neighbor)`` callback and weighted with
+``cost(node, neighbor)``.
+
+Every search accepts several starting nodes, stops as soon as `target` is
+settled (if given) and can record each node's predecessor to rebuild paths.
+Nodes that weren't reached have a distance of `UNREACHED`.
+
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+
+UNREACHED = -1
+
+Neighbors = Sequence[Sequence[int]]
+Passable = Callable[[int, int], bool]
+Cost = Callable[[int, int], int]
+
+
+@dataclass
+class SearchResult:
+    distances: list[int]
+    predecessors: list[int] | None = None
+
+    def distance(self, node: int) -> int | None:
+        distance = self.distances[node]
+        return None if distance == UNREACHED else distance
+
+    def path(self, node: int) -> list[int]:
+        """The nodes from a start to `node` (empty if it wasn't reached)."""
+        if self.predecessors is None:
+            raise ValueError("Predecessors weren't tracked")
+        if self.distances[node] == UNREACHED:
+            return []
+        path = [node]
+        while (node := self.predecessors[node]) != UNREACHED:
+            path.append(node)
+        path.reverse()
+        return path
+
+
+def bfs(
+    neighbors: Neighbors,
+    starts: Iterable[int],
+    *,
+    passable: Passable | None = None,
+    target: int | None = None,
+    predecessors: bool = False,
+) -> SearchResult:
+    """Breadth first search, where every edge costs 1."""
+    distances = [UNREACHED] * len(neighbors)
+    previous = [UNREACHED] * len(neighbors) if predecessors else None
+    queue = deque()
+    for start in starts:
+        distances[start] = 0
+        queue.append(start)
+
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            break
+        distance = distances[node] + 1
+        for neighbor in neighbors[node]:
+            if distances[neighbor] != UNREACHED:
+                continue
+            if passable is not None and not passable(node, neighbor):
+                continue
+            distances[neighbor] = distance
+            if previous is not None:
+                previous[neighbor] = node
+            queue.append(neighbor)
+    return SearchResult(distances, previous)
+
+
+def dijkstra(
+    neighbors: Neighbors,
+    starts: Iterable[int],
+    cost: Cost,
+    *,
+    passable: Passable | None = None,
+    target: int | None = None,
+    predecessors: bool = False,
+) -> SearchResult:
+    """Dijkstra's algorithm with a binary heap, for non-negative edge costs."""
+    return astar(
+        neighbors,
+        starts,
+        cost,
+        None,
+        passable=passable,
+        target=target,
+        predecessors=predecessors,
+    )
+
+
+def astar(
+    neighbors: Neighbors,
+    starts: Iterable[int],
+    cost: Cost,
+    heuristic: Callable[[int], int] | None,
+    *,
+    passable: Passable | None = None,
+    target: int | None = None,
+    predecessors: bool = False,
+) -> SearchResult:
+    """A* search, the `heuristic` must never overestimate the distance to `target`.
+
+    Only nodes that were settled before reaching `target` have final distances.
+
+    """
+    distances = [UNREACHED] * len(neighbors)
+    previous = [UNREACHED] * len(neighbors) if predecessors else None
+    settled = bytearray(len(neighbors))
+    heap = []
+    for start in starts:
+        distances[start] = 0
+        heap.append((heuristic(start) if heuristic else 0, 0, start))
+    heapq.heapify(heap)
+
+    while heap:
+        _estimate, distance, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        if node == target:
+            break
+        for neighbor in neighbors[node]:
+            if settled[neighbor]:
+                continue
+            if passable is not None and not passable(node, neighbor):
+                continue
+            new_distance = distance + cost(node, neighbor)
+            old_distance = distances[neighbor]
+            if old_distance != UNREACHED and old_distance <= new_distance:
+                continue
+            distances[neighbor] = new_distance
+            if previous is not None:
+                previous[neighbor] = node
+            estimate = new_distance + heuristic(neighbor) if heuristic else new_distance
+            heapq.heappush(heap, (estimate, new_distance, neighbor))
+    return SearchResult(distances, previous)
+
+
+def bidirectional_bfs(
+    neighbors: Neighbors,
+    start: int,
+    target: int,
+    *,
+    passable: Passable | None = None,
+    reverse_passable: Passable | None = None,
+) -> int | None:
+    """Breadth first search from both ends at once, returning the distance.
+
+    The search from `target` walks edges backwards, so the graph's edges need
+    to go both ways (like a grid's); ``reverse_passable(node, neighbor)`` says
+    whether the edge from `neighbor` to `node` can be taken, and defaults to
+    `passable` with its arguments swapped. The smaller frontier is expanded a
+    whole level at a time, until the two searches meet.
+
+    """
+    if start == target:
+        return 0
+    if reverse_passable is None and passable is not None:
+
+        def reverse_passable(node: int, neighbor: int) -> bool:
+            return passable(neighbor, node)
+
+    distances = ([UNREACHED] * len(neighbors), [UNREACHED] * len(neighbors))
+    distances[0][start] = 0
+    distances[1][target] = 0
+    frontiers = [[start], [target]]
+    checks = (passable, reverse_passable)
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        ours, theirs, check = distances[side], distances[1 - side], checks[side]
+        shortest = None
+        next_frontier = []
+        for node in frontiers[side]:
+            distance = ours[node] + 1
+            for neighbor in neighbors[node]:
+                if ours[neighbor] != UNREACHED:
+                    continue
+                if check is not None and not check(node, neighbor):
+                    continue
+                ours[neighbor] = distance
+                if theirs[neighbor] != UNREACHED:
+                    total = distance + theirs[neighbor]
+                    if shortest is None or total < shortest:
+                        shortest = total
+                next_frontier.append(neighbor)
+        if shortest is not None:
+            # the whole level was checked, so nothing shorter can meet later
+            return shortest
+        frontiers[side] = next_frontier
+    return None
+
+
+def bidirectional_dijkstra(
+    neighbors: Neighbors, start: int, target: int, cost: Cost
+) -> tuple[int, list[int]] | None:
+    """Dijkstra's algorithm from both ends at once, returning (distance, path).
+
+    Like `bidirectional_bfs`, the graph's edges need to go both ways; the
+    search from `target` walks them backwards, so stepping from `node` back
+    to `neighbor` costs ``cost(neighbor, node)``. It stops once the lowest
+    distances left in the two heaps can't add up to anything less than the
+    shortest path through a node both searches have reached.
+
+    """
+    if start == target:
+        return 0, [start]
+    size = len(neighbors)
+    distances = ([UNREACHED] * size, [UNREACHED] * size)
+    distances[0][start] = 0
+    distances[1][target] = 0
+    # the node before each one on the path (forwards) and after it (backwards)
+    links = ([UNREACHED] * size, [UNREACHED] * size)
+    heaps = ([(0, start)], [(0, target)])
+
+    shortest, meeting = None, UNREACHED
+    while heaps[0] and heaps[1]:
+        if shortest is not None and heaps[0][0][0] + heaps[1][0][0] >= shortest:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        ours, theirs, heap = distances[side], distances[1 - side], heaps[side]
+        distance, node = heapq.heappop(heap)
+        if distance > ours[node]:
+            continue
+        for neighbor in neighbors[node]:
+            if side == 0:
+                new_distance = distance + cost(node, neighbor)
+            else:
+                new_distance = distance + cost(neighbor, node)
+            old_distance = ours[neighbor]
+            if old_distance != UNREACHED and old_distance <= new_distance:
+                continue
+            ours[neighbor] = new_distance
+            links[side][neighbor] = node
+            heapq.heappush(heap, (new_distance, neighbor))
+            if theirs[neighbor] != UNREACHED:
+                total = new_distance + theirs[neighbor]
+                if shortest is None or total < shortest:
+                    shortest, meeting = total, neighbor
+
+    if shortest is None:
+        return None
+    path = [meeting]
+    node = meeting
+    while (node := links[0][node]) != UNREACHED:
+        path.append(node)
+    path.reverse()
+    node = meeting
+    while (node := links[1][node]) != UNREACHED:
+        path.append(node)
+    return shortest, path
+
+
+class GridNeighbors(Sequence):
+    """The neighbors of a grid's cells (by index), worked out when asked for.
+
+    Unlike a table of them, this takes no memory per cell, so it suits grids
+    (like a tiled one) that don't store their cells either.
+
+    """
+
+    def __init__(self, width: int, height: int, *, diagonal: bool = False):
+        self.width = width
+        self.height = height
+        self.diagonal = diagonal
+        # (delta x, delta y, delta index) for each neighbor
+        self.offsets = ((0, -1, -width), (-1, 0, -1), (1, 0, 1), (0, 1, width))
+        if diagonal:
+            self.offsets += (
+                (-1, -1, -width - 1),
+                (1, -1, -width + 1),
+                (-1, 1, width - 1),
+                (1, 1, width + 1),
+            )
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __getitem__(self, index: int) -> tuple[int, ...]:
+        width, height = self.width, self.height
+        if not 0 <= index < width * height:
+            raise IndexError(f"Not inside grid: {index}")
+        y, x = divmod(index, width)
+        if 0 < x < width - 1 and 0 < y < height - 1:
+            # the cells away from the edges, which is nearly all of them
+            if self.diagonal:
+                return tuple(index + delta for _dx, _dy, delta in self.offsets)
+            return (index - width, index - 1, index + 1, index + width)
+        return tuple(
+            index + delta
+            for dx, dy, delta in self.offsets
+            if 0 <= x + dx < width and 0 <= y + dy < height
+        )
+
+
+def manhattan(width: int, target: int) -> Callable[[int], int]:
+    """A* heuristic for a grid `width` cells wide, where each step costs at least 1."""
+    target_x, target_y = target % width, target // width
+
+    def heuristic(node: int) -> int:
+        return abs(node % width - target_x) + abs(node // width - target_y)
+
+    return heuristic
+
+
+def _sample_graph():
+    # a 4 x 3 grid, where entering a cell costs its value
+    values = [int(value) for value in "116313812136"]
+    return values, GridNeighbors(4, 3), lambda _node, neighbor: values[neighbor]
+
+
+def test_bfs():
+    values, neighbors, _cost = _sample_graph()
+    result = bfs(neighbors, [0], target=11, predecessors=True)
+    assert result.distance(11) == 5
+    assert len(result.path(11)) == 6
+    # a wall down the middle
+    result = bfs(neighbors, [0, 11], passable=lambda _n, neighbor: neighbor % 4 != 2)
+    assert result.distances == [0, 1, -1, 2, 1, 2, -1, 1, 2, 3, -1, 0]
+
+
+def test_bidirectional_bfs():
+    values, neighbors, _cost = _sample_graph()
+
+    def climb(node: int, neighbor: int) -> bool:
+        return values[neighbor] <= values[node] + 1
+
+    for start, target in ((0, 11), (11, 0), (6, 3), (5, 5), (0, 2)):
+        expected = bfs(neighbors, [start], passable=climb).distance(target)
+        assert bidirectional_bfs(neighbors, start, target, passable=climb) == expected
+    assert bidirectional_bfs(neighbors, 0, 2, passable=climb) is None
+
+
+def test_bidirectional_dijkstra():
+    values, neighbors, cost = _sample_graph()
+    for start, target in ((0, 11), (11, 0), (6, 3), (5, 5)):
+        expected = dijkstra(neighbors, [start], cost, predecessors=True)
+        distance, path = bidirectional_dijkstra(neighbors, start, target, cost)
+        assert distance == expected.distance(target)
+        assert (path[0], path[-1]) == (start, target)
+        assert sum(values[node] for node in path[1:]) == distance
+    assert bidirectional_dijkstra(neighbors, 0, 11, cost)[0] == 13
+
+
+def test_grid_neighbors():
+    neighbors = GridNeighbors(4, 3)
+    assert neighbors[0] == (1, 4)
+    assert neighbors[5] == (1, 4, 6, 9)
+    assert neighbors[11] == (7, 10)
+    assert len(neighbors) == len(list(neighbors)) == 12
+    assert sorted(GridNeighbors(3, 3, diagonal=True)[4]) == [0, 1, 2, 3, 5, 6, 7, 8]
+    assert sorted(GridNeighbors(3, 3, diagonal=True)[0]) == [1, 3, 4]
+    assert GridNeighbors(1, 1)[0] == ()
+
+
+def test_weighted_searches():
+    values, neighbors, cost = _sample_graph()
+    result = dijkstra(neighbors, [0], cost, predecessors=True)
+    assert result.distance(11) == 13
+    assert [values[node] for node in result.path(11)] == [1, 1, 2, 1, 3, 6]
+    heuristic = manhattan(4, 11)
+    result = astar(neighbors, [0], cost, heuristic, target=11, predecessors=True)
+    assert result.distance(11) == 13
+    assert result.path(11)[0] == 0
+    result = dijkstra(
+        neighbors,
+        [0],
+        cost,
+        passable=lambda _node, neighbor: neighbor < 8,
+        predecessors=True,
+    )
+    assert result.distance(11) is None
+    assert result.path(11) == []
@@ -0,0 +1,201 @@
+"""The `main()` shared by the daily solutions.
+
+Usage: ./day##.py [--verbose] [--profile] [--profile-format=collapsed]
+                  [--trace-memory] [--trace[=EVERY]] [--no-cache]
+       ./day##.py --inputs DIR|GLOB [--jobs N] [--output FILE.csv|FILE.jsonl]
+
+Answers are cached (see `aoc.cache`), so re-running an unchanged day on the
+same input doesn't solve it again.
+
+With `--inputs`, every matching input is solved across a pool of processes
+and each result is written (as JSON lines, unless the output is a ``.csv``)
+as soon as it's done. Those answers aren't cached, as each input is usually
+only solved once.
+
+"""
+
+from __future__ import annotations
+
+import glob
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from aoc import profiling
+from aoc.cache import MISSING, AnswerCache, input_digest, source_digest
+from aoc.days import Day
+from aoc.inputs import MappedInput
+from aoc.runner import run_inputs, write_results
+
+
+def main(
+    module_name: str,
+    *,
+    mapped_input: bool = False,
+    switches: dict[str, str] | None = None,
+):
+    """Solve both parts of the day in `module_name` for its puzzle input.
+
+    Set `mapped_input` if the day's `parse_input()` accepts a `MappedInput`.
+
+    `switches` are the day's own on/off flags, as ``{name: help}``; like
+    ``--verbose``, each one sets the module global of the same name.
+
+    """
+    module = sys.modules[module_name]
+    switches = switches or {}
+    parser = ArgumentParser()
+    parser.add_argument("--verbose", "-v", action="store_true")
+    for name, help_ in switches.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", action="store_true", help=help_
+        )
+    parser.add_argument(
+        "--profile", action="store_true", help="profile each part with cProfile"
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=("pstats", "collapsed"),
+        help="collapsed writes flamegraph stacks to day#-part#.collapsed",
+    )
+    parser.add_argument("--profile-sort", default="cumulative")
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="show top allocations per part"
+    )
+    parser.add_argument(
+        "--trace",
+        type=int,
+        nargs="?",
+        const=1,
+        metavar="EVERY",
+        help="count the day's traced events, printing every EVERYth one",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_false", dest="cache", help="don't reuse answers"
+    )
+    parser.add_argument(
+        "--inputs", metavar="DIR|GLOB", help="solve every input in DIR (or GLOB)"
+    )
+    parser.add_argument("--jobs", "-j", type=int, help="worker processes for --inputs")
+    parser.add_argument(
+        "--output", "-o", type=Path, help="--inputs results file (.csv or .jsonl)"
+    )
+
+    args = parser.parse_args()
+    if args.trace_memory and (args.profile or args.profile_format):
+        parser.error("--trace-memory can't be combined with profiling")
+    if args.inputs and (args.profile or args.profile_format or args.trace_memory):
+        parser.error("--inputs can't be combined with profiling")
+    if args.inputs and (args.verbose or args.trace is not None):
+        # the workers' output would be interleaved with the results
+        parser.error("--inputs can't be combined with --verbose or --trace")
+    if args.output and not args.inputs:
+        parser.error("--output only applies to --inputs")
+    if args.output and args.output.suffix not in (".csv", ".jsonl"):
+        parser.error("--output needs to be a .csv or .jsonl file")
+    if args.trace is not None and args.trace < 1:
+        parser.error("--trace needs to print at least every 1st event")
+    if args.trace is not None and not hasattr(module, "tracer"):
+        parser.error("--trace needs the day to have a `tracer`")
+    if args.verbose:
+        module.verbose = True
+    for name in switches:
+        if getattr(args, name):
+            setattr(module, name, True)
+    if args.trace is not None:
+        module.tracer.enable(sample=args.trace)
+    if (
+        args.verbose
+        or args.profile
+        or args.profile_format
+        or args.trace_memory
+        or args.trace is not None
+    ):
+        # the point of these is to watch it run
+        args.cache = False
+    if any(getattr(args, name) for name in switches):
+        # the cache is keyed on the source, so it can't tell the switches apart
+        args.cache = False
+    if args.inputs:
+        # one-off inputs would only push every other day's answers out
+        args.cache = False
+
+    # the download script doesn't add the leading 0
+    day = int(Path(module.__file__).stem.removeprefix("day"))
+    if args.inputs:
+        settings = {name: True for name in switches if getattr(args, name)}
+        return solve_inputs(module, day, args, settings)
+
+    input_file = Path(f"day{day}-input.txt")
+    print(f"Reading input from {input_file}")
+    if mapped_input:
+        with MappedInput(input_file) as puzzle_input:
+            solve_parts(module, day, input_file, puzzle_input, args)
+    else:
+        solve_parts(module, day, input_file, input_file.read_text(), args)
+
+
+def find_inputs(pattern: str) -> list[Path]:
+    """All the files in a directory, or matching a glob."""
+    if Path(pattern).is_dir():
+        return sorted(path for path in Path(pattern).iterdir() if path.is_file())
+    return sorted(
+        Path(path)
+        for path in glob.glob(pattern, recursive=True)
+        if Path(path).is_file()
+    )
+
+
+def solve_inputs(module, day: int, args, settings: dict[str, bool]):
+    year = Path(module.__file__).resolve().parent.name
+    if not year.isdigit():
+        return "--inputs only works for the solutions in a year's directory"
+    input_files = find_inputs(args.inputs)
+    if not input_files:
+        return f"No inputs found in {args.inputs}"
+    # workers load their own copy of the solution, so the switches are passed on
+    results = run_inputs(
+        Day(int(year), day),
+        input_files,
+        jobs=args.jobs,
+        use_cache=args.cache,
+        settings=settings,
+    )
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            failures = write_results(results, f, args.output.suffix.lstrip("."))
+        print(f"Solved {len(input_files)} inputs, results are in {args.output}")
+    else:
+        failures = write_results(results, sys.stdout, "jsonl")
+    if failures:
+        return f"{failures} parts failed"
+
+
+def solve_parts(module, day: int, input_file: Path, puzzle_input, args):
+    if args.cache:
+        answers = AnswerCache()
+        source = source_digest(module)
+        input_ = input_digest(input_file)
+
+    for part, func in ((1, module.part1), (2, module.part2)):
+        if args.cache:
+            answer = answers.get(source, part, input_)
+            if answer is not MISSING:
+                print(f"Day #{day} part {part} solution:", answer, "(cached)")
+                continue
+
+        if args.profile_format == "collapsed":
+            output = Path(f"day{day}-part{part}.collapsed")
+            answer = profiling.profile_collapsed(func, puzzle_input, output=output)
+        elif args.profile or args.profile_format == "pstats":
+            answer = profiling.profile_stats(func, puzzle_input, sort=args.profile_sort)
+        elif args.trace_memory:
+            answer = profiling.trace_memory(func, puzzle_input)
+        else:
+            answer = func(puzzle_input)
+        print(f"Day #{day} part {part} solution:", answer)
+        if args.trace is not None:
+            print(module.tracer.report())
+            module.tracer.reset()
+        if args.cache:
+            answers.put(source, part, input_, answer)
@@ -0,0 +1,123 @@
+"""Count events in hot loops, and print a sample of them, only when asked to.
+
+A solution creates one `Tracer` and marks the functions it wants to watch::
+
+    tracer = Tracer()
+
+    @tracer.traced("compare")
+    def validate(left, right):
+        ...
+
+While tracing is off, `traced` leaves the function exactly as it was, so it
+costs nothing. `Tracer.enable()` swaps the module's function for a wrapper
+that counts each call (which includes recursive calls, as they look the
+function up by name) and prints every `sample`-th one.
+
+Loops that don't call a function can hoist ``tracer.enabled`` into a local
+before the loop and call `Tracer.event` behind it.
+
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+from collections import Counter
+from collections.abc import Callable
+from typing import TextIO
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.sample = 1
+        self.output: TextIO = sys.stderr
+        self.counters: Counter[str] = Counter()
+        self._traced: list[tuple[dict, str, str, Callable]] = []
+
+    def traced(self, event: str | None = None):
+        """Decorate a module level function to record an event per call."""
+
+        def decorator(func):
+            self._traced.append(
+                (func.__globals__, func.__name__, event or func.__name__, func)
+            )
+            return func
+
+        return decorator
+
+    def enable(self, *, sample: int = 1, output: TextIO | None = None):
+        """Start counting, printing every `sample`-th occurrence of each event."""
+        if sample < 1:
+            raise ValueError(f"sample needs to be at least 1, not {sample}")
+        self.enabled = True
+        self.sample = sample
+        if output is not None:
+            self.output = output
+        for namespace, name, event, func in self._traced:
+            namespace[name] = self._wrap(event, func)
+
+    def disable(self):
+        self.enabled = False
+        for namespace, name, _event, func in self._traced:
+            namespace[name] = func
+
+    def _wrap(self, event: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.event(event, *args)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def event(self, name: str, *details):
+        count = self.counters[name] + 1
+        self.counters[name] = count
+        if (count - 1) % self.sample == 0:
+            print(f"{name} #{count}:", *details, file=self.output)
+
+    def report(self) -> str:
+        """The count of each event, most frequent first."""
+        return "\n".join(
+            f"{count:>12,}  {name}" for name, count in self.counters.most_common()
+        )
+
+    def reset(self):
+        self.counters.clear()
+
+
+def test_tracer():
+    import io
+
+    import pytest
+
+    tracer = Tracer()
+    namespace = {}
+    exec(
+        "def square(value):\n"
+        "    return 1 if value < 2 else square(value - 1) + 2 * value - 1\n",
+        namespace,
+    )
+    original = tracer.traced("square")(namespace["square"])
+    assert namespace["square"] is original
+    assert original(5) == 25
+    assert not tracer.counters
+
+    output = io.StringIO()
+    tracer.enable(sample=2, output=output)
+    try:
+        assert namespace["square"](5) == 25
+    finally:
+        tracer.disable()
+    assert tracer.counters == {"square": 5}
+    assert output.getvalue().splitlines() == [
+        "square #1: 5",
+        "square #3: 3",
+        "square #5: 1",
+    ]
+    assert tracer.report() == "           5  square"
+    assert namespace["square"] is original
+
+    with pytest.raises(ValueError):
+        tracer.enable(sample=0)
+    assert not tracer.enabled
@@ -1,5 +1,4 @@
 #!/bin/sh
+# Usage: ./get-input.sh YEAR [DAY ...]
 
-curl "https://adventofcode.com/${1}/day/${2}/input" \
-    --header "Cookie: $(cat .token)" \
-    --output ${1}/day${2}-input.txt
+cd "$(dirname "$0")" && exec python3 -m aoc fetch "$@"